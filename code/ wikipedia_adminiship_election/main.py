@@ -1,4 +1,5 @@
 from wikipedia_adminiship_election.code.wikpedia_adminship_election_parser import WikipediaAdminshipElectionParser
+from util.src.instrumentation import instrumentation
 
 
 def export_graph():
@@ -18,6 +19,8 @@ def export_graph():
             parser.export_graph_properties(path_destination, 'properties.txt', subgraph)
 
     parser.export_properties(path_destination, 'properties.txt', graphs)
+    if instrumentation.enabled:
+        instrumentation.write_report(path_destination + 'instrumentation.json')
 
 if __name__ == '__main__':
     export_graph()
@@ -1,8 +1,9 @@
 import os
-from typing import List, Tuple
+from typing import Iterator, List, Tuple, Union
 
 from util.src.graph import Graph
 from util.src.instance_parser_interface import InstanceParserInterface
+from util.src.temporal_snapshots import temporal_snapshots
 
 
 def get_numbers(line):
@@ -34,3 +35,26 @@ class BitcoinParser(InstanceParserInterface):
                 graph.add_edge(u, v, -1)
 
         return graph
+
+    def parse_temporal(self, content: Tuple[str, str], cut_points: Union[int, List[int]],
+                       window: int = None) -> Iterator[Tuple[int, Graph]]:
+        """
+        Parses the content once and yields a snapshot of the graph at each cut point, see ``temporal_snapshots``.
+        Unlike ``parse_content``, the two ratings between a pair of users are merged into a single undirected edge,
+        whose sign is the sign of the most recent rating in the snapshot.
+        The same graph object is updated and yielded at every cut point, so it must be saved or copied before asking
+        for the next snapshot.
+        :param content: Tuple with the name and the content of the file
+        :param cut_points: Increasing timestamps of the snapshots, or the number of snapshots to take at evenly spaced
+        timestamps between the first and the last rating
+        :param window: If None, each snapshot contains all the ratings up to its cut point. Otherwise, it only contains
+        the ratings with timestamp in ``(cut_point - window, cut_point]``
+        :return: Iterator of tuples with the cut point and the snapshot
+        :raises ValueError: If the content has no ratings
+        """
+        ratings = []
+        for line in content[1].split('\n')[1:]:
+            if line.strip():
+                v, u, w, timestamp = get_numbers(line)
+                ratings.append((timestamp, u, v, 1 if w > 0 else -1))
+        return temporal_snapshots(content[0], ratings, cut_points, window)
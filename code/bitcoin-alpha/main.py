@@ -1,4 +1,5 @@
 from bitcoin_alpha_parser import BitcoinParser
+from util.src.instrumentation import instrumentation
 
 
 def export_graph():
@@ -18,6 +19,16 @@ def export_graph():
             parser.export_graph_properties(path_destination, 'properties.txt', subgraph)
 
     parser.export_properties(path_destination, 'properties.txt', graphs)
+    if instrumentation.enabled:
+        instrumentation.write_report(path_destination + 'instrumentation.json')
+
+def export_temporal_graphs(num_snapshots=100, window=None):
+    path_origin = '../original/'
+    path_destination = '../dataset/temporal/'
+    parser = BitcoinParser()
+    for name, content in parser.read_graphs_from_path(path_origin):
+        for cut_point, snapshot in parser.parse_temporal((name, content), num_snapshots, window):
+            snapshot.save_graph_to_file(path_destination, f'{cut_point}-{name}')
 
 if __name__ == '__main__':
     export_graph()
@@ -1,4 +1,5 @@
 from congress_parser import CongressParser
+from util.src.instrumentation import instrumentation
 
 
 def export_graph():
@@ -11,6 +12,8 @@ def export_graph():
         graph_anonymized.save_graph_to_file(path_destination)
 
     parser.export_properties(path_destination, 'properties.txt', graphs)
+    if instrumentation.enabled:
+        instrumentation.write_report(path_destination + 'instrumentation.json')
 
 if __name__ == '__main__':
     export_graph()
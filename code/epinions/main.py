@@ -1,10 +1,18 @@
+import os
+import random
+
 from epinons_parser import EpinionsParser
+from util.src.edge_list_converter import EdgeListConverter
+from util.src.graph_sampler import GraphSampler
+from util.src.instrumentation import instrumentation
 
 
 def export_graph():
     path_origin = '../original/'
     path_destination = '../dataset/'
-    min_num_vertices_list = [100,500,1000,2500]#,5000,10000,15000,20000,25000,30000,40000,50000,70000,90000,100000]
+    min_num_vertices_list = [100,500,1000,2500]
+    # generate_subgraph gets too slow for these sizes, they are sampled with a breadth first search instead
+    snowball_num_vertices_list = [5000,10000,15000,20000,25000,30000,40000,50000,70000,90000,100000]
     parser = EpinionsParser()
     graphs = parser.parse(path_origin)
     for graph in graphs:
@@ -16,9 +24,30 @@ def export_graph():
             subgraph= graph_anonymized.generate_subgraph(min_num_vertices)
             subgraph,_,_ = subgraph.generate_numeric_graph()
             subgraph.save_graph_to_file(path_destination)
-            parser.export_graph_properties(path_destination, 'properties.txt', subgraph)
+            parser.export_graph_properties(path_destination, 'properties.txt', subgraph,
+                                           {'sampler': 'generate_subgraph', 'seed': 42})
+
+        sampler = GraphSampler(graph_anonymized, rng=random.Random(42))
+        for num_vertices in snowball_num_vertices_list:
+            print(num_vertices)
+            subgraph = sampler.snowball(num_vertices)
+            subgraph,_,_ = subgraph.generate_numeric_graph()
+            subgraph.save_graph_to_file(path_destination)
+            parser.export_graph_properties(path_destination, 'properties.txt', subgraph,
+                                           {'sampler': 'snowball', 'seed': 42})
+
+    parser.export_properties(path_destination, 'properties.txt', graphs, {'sampler': '', 'seed': ''})
+    if instrumentation.enabled:
+        instrumentation.write_report(path_destination + 'instrumentation.json')
 
-    parser.export_properties(path_destination, 'properties.txt', graphs)
+def export_undirected_graph(chunk_size=5000000):
+    # converts the full directed dump without loading it in memory, merging reciprocal edges as in the README
+    path_origin = '../original/'
+    path_destination = '../dataset/undirected/'
+    converter = EdgeListConverter(chunk_size=chunk_size)
+    for file_name in os.listdir(path_origin):
+        num_vertices, num_edges = converter.convert(path_origin + file_name, path_destination + file_name)
+        print(file_name, num_vertices, num_edges)
 
 if __name__ == '__main__':
     export_graph()
@@ -0,0 +1,178 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from util.src.graph import parse_dataset_header, split_dataset_file
+
+
+class ValidationProblem(NamedTuple):
+    """
+    A problem found in a dataset file. ``line`` is the 1-based line number, or 0 if the problem concerns the whole file.
+    """
+    path: str
+    line: int
+    message: str
+
+    def __str__(self):
+        return f"{self.path}:{self.line}: {self.message}"
+
+
+class DatasetValidator:
+    """
+    DatasetValidator
+    ================
+
+    :class:`DatasetValidator` checks that dataset files follow the format described in the README. A file may start
+    with comment lines beginning with ``#`` (as the harwell-boeing instances), followed by a header ``V E`` or
+    ``vertices: V edges: E``, and one line ``VertexA VertexB Weight`` per edge. The validator reports:
+
+    - malformed header or edge lines,
+    - a number of edge lines different from ``E`` in the header,
+    - vertex ids outside ``[1, V]``,
+    - self-loops,
+    - duplicate undirected edges (``u v`` and ``v u`` count as the same edge),
+    - weights other than -1 and 1.
+
+    The edge lines are parsed and checked with NumPy arrays, and ``validate_tree`` checks the files in parallel.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            problems = DatasetValidator().validate_tree('datasets/')
+            for problem in problems:
+                print(problem)
+
+        It can also be run as a script, which exits with status 1 if any problem is found:
+
+        .. code-block:: bash
+
+            python -m util.src.dataset_validator datasets/
+    """
+
+    def __init__(self, max_problems_per_check: int = 10):
+        """
+        :param max_problems_per_check: Maximum number of lines reported for each kind of problem in a file. The total
+        number of lines with that problem is always reported.
+        """
+        self._max_problems_per_check: int = max_problems_per_check
+
+    def validate_file(self, path: str) -> List[ValidationProblem]:
+        """
+        Validates one dataset file.
+        :param path: Path to the file
+        :return: List of the problems found, empty if the file is valid
+        """
+        with open(path, 'rb') as file:
+            first_line, header_line, body = split_dataset_file(file.read())
+        if header_line is None:
+            return [ValidationProblem(path, 0, "the file has no header")]
+        header = parse_dataset_header(header_line)
+        if header is None:
+            return [ValidationProblem(path, first_line + 1, f"malformed header {header_line!r}")]
+        num_vertices, num_edges = header
+
+        problems = []
+        # line number of each edge line
+        line_numbers = np.arange(first_line + 2, first_line + 2 + len(body))
+        num_tokens = np.fromiter(map(len, map(bytes.split, body)), dtype=np.int64, count=len(body))
+        if len(body) != num_edges:
+            problems.append(ValidationProblem(path, first_line + 1,
+                                              f"the header says {num_edges} edges but there are {len(body)} edge lines"))
+        malformed = num_tokens != 3
+        problems += self.__report(path, line_numbers[malformed], "the line does not have 3 values")
+        if malformed.any():
+            body = [line for line, is_malformed in zip(body, malformed.tolist()) if not is_malformed]
+            line_numbers = line_numbers[~malformed]
+
+        try:
+            values = np.array(b' '.join(body).split()).astype(np.int64).reshape(-1, 3)
+        except ValueError:
+            values, not_integer = _parse_lines(body)
+            problems += self.__report(path, line_numbers[not_integer], "the values are not integers")
+            line_numbers = line_numbers[~not_integer]
+        u, v, weights = values[:, 0], values[:, 1], values[:, 2]
+
+        out_of_range = (u < 1) | (u > num_vertices) | (v < 1) | (v > num_vertices)
+        problems += self.__report(path, line_numbers[out_of_range], f"vertex id outside [1, {num_vertices}]")
+        problems += self.__report(path, line_numbers[u == v], "self-loop")
+        problems += self.__report(path, line_numbers[(weights != 1) & (weights != -1)], "weight is not -1 or 1")
+
+        keys = np.minimum(u, v) * (np.int64(max(num_vertices, 0)) + 1) + np.maximum(u, v)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        duplicated = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1]) + 1
+        # the first line of each group of equal edges, to point at the line that is duplicated
+        is_group_start = np.ones(len(sorted_keys), dtype=bool)
+        is_group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        group_start = np.maximum.accumulate(np.where(is_group_start, np.arange(len(sorted_keys)), 0))
+        originals = line_numbers[order[group_start[duplicated]]]
+        duplicates = line_numbers[order[duplicated]]
+        problems += self.__report(path, duplicates, "duplicate edge", originals)
+        return sorted(problems, key=lambda problem: problem.line)
+
+    def validate_tree(self, root: str, extension: str = '.txt', processes: int = None) -> List[ValidationProblem]:
+        """
+        Validates every file with the given extension under a directory, in parallel.
+        :param root: Directory to validate
+        :param extension: Extension of the dataset files
+        :param processes: Number of worker processes. Defaults to the number of CPUs
+        :return: List of the problems found in all the files, sorted by path
+        """
+        paths = sorted(os.path.join(directory, file_name)
+                       for directory, _, file_names in os.walk(root)
+                       for file_name in file_names if file_name.endswith(extension))
+        problems = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for file_problems in executor.map(self.validate_file, paths, chunksize=16):
+                problems += file_problems
+        return problems
+
+    def __report(self, path: str, line_numbers: np.ndarray, message: str,
+                 original_line_numbers: np.ndarray = None) -> List[ValidationProblem]:
+        """
+        Builds the problems of one kind, keeping only the first ``max_problems_per_check`` lines.
+        """
+        problems = []
+        for i, line in enumerate(line_numbers[:self._max_problems_per_check].tolist()):
+            detail = message if original_line_numbers is None else f"{message} of line {original_line_numbers[i]}"
+            problems.append(ValidationProblem(path, line, detail))
+        if len(line_numbers) > self._max_problems_per_check:
+            problems.append(ValidationProblem(path, 0, f"{len(line_numbers)} lines in total with: {message}"))
+        return problems
+
+
+def _parse_lines(lines: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses edge lines one by one, for the files in which some value is not an integer.
+    :return: Tuple with a N x 3 array with the values of the valid lines and a boolean array telling which lines are
+    not valid
+    """
+    values = []
+    not_integer = np.zeros(len(lines), dtype=bool)
+    for i, line in enumerate(lines):
+        try:
+            values.append([int(value) for value in line.split()])
+        except ValueError:
+            not_integer[i] = True
+    return np.array(values, dtype=np.int64).reshape(-1, 3), not_integer
+
+
+def main(arguments: List[str]) -> int:
+    roots = arguments if arguments else ['datasets']
+    validator = DatasetValidator()
+    problems_by_root: Dict[str, List[ValidationProblem]] = {root: validator.validate_tree(root) for root in roots}
+    num_problems = 0
+    for problems in problems_by_root.values():
+        for problem in problems:
+            print(problem)
+        num_problems += len(problems)
+    print(f"{num_problems} problems found", file=sys.stderr)
+    return 1 if num_problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,91 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from util.src.graph import Graph, read_edge_arrays
+
+
+class DuplicateFinder:
+    """
+    DuplicateFinder
+    ===============
+
+    :class:`DuplicateFinder` finds dataset files that contain the same graph up to a relabeling of the vertices, as
+    samples of the same graph taken with different seeds or the relabeled variants of an instance. The files are grouped
+    by the fingerprint of their graph (see ``Graph.fingerprint``), so the graphs of a group are very likely isomorphic,
+    while graphs in different groups are certainly not.
+
+    The files are parsed straight into NumPy arrays, without building a :class:`Graph`, and fingerprinted in parallel.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            for group in DuplicateFinder().find_duplicates('datasets/'):
+                print(' '.join(group))
+
+        It can also be run as a script, which prints one group of likely duplicates per line:
+
+        .. code-block:: bash
+
+            python -m util.src.duplicate_finder datasets/
+    """
+
+    def __init__(self, wl_rounds: int = 3, processes: int = None):
+        """
+        :param wl_rounds: Number of rounds of Weisfeiler-Lehman refinement of the fingerprints
+        :param processes: Number of worker processes. Defaults to the number of CPUs
+        """
+        self._wl_rounds: int = wl_rounds
+        self._processes: int = processes
+
+    def fingerprint_file(self, path: str) -> str:
+        """
+        Computes the fingerprint of the graph of a dataset file.
+        :param path: Path to the file
+        :return: The fingerprint, the same as ``Graph.fingerprint`` of the graph read from the file
+        """
+        num_vertices, u, v, weights = read_edge_arrays(path)
+        return Graph.fingerprint_arrays(num_vertices, u, v, weights, self._wl_rounds)
+
+    def fingerprint_tree(self, root: str, extension: str = '.txt') -> Dict[str, str]:
+        """
+        Computes the fingerprints of every file with the given extension under a directory, in parallel.
+        :param root: Directory with the dataset files
+        :param extension: Extension of the dataset files
+        :return: Dictionary from the path of each file to its fingerprint, sorted by path
+        """
+        paths = sorted(os.path.join(directory, file_name)
+                       for directory, _, file_names in os.walk(root)
+                       for file_name in file_names if file_name.endswith(extension))
+        with ProcessPoolExecutor(max_workers=self._processes) as executor:
+            return dict(zip(paths, executor.map(self.fingerprint_file, paths, chunksize=16)))
+
+    def find_duplicates(self, root: str, extension: str = '.txt') -> List[List[str]]:
+        """
+        Finds the groups of files under a directory that contain likely isomorphic graphs.
+        :param root: Directory with the dataset files
+        :param extension: Extension of the dataset files
+        :return: List of the groups of two or more files with the same fingerprint, each group sorted by path
+        """
+        groups: Dict[str, List[str]] = {}
+        for path, fingerprint in self.fingerprint_tree(root, extension).items():
+            groups.setdefault(fingerprint, []).append(path)
+        return sorted(group for group in groups.values() if len(group) > 1)
+
+
+def main(arguments: List[str]) -> int:
+    roots = arguments if arguments else ['datasets']
+    finder = DuplicateFinder()
+    num_groups = 0
+    for root in roots:
+        for group in finder.find_duplicates(root):
+            print(' '.join(group))
+            num_groups += 1
+    print(f"{num_groups} groups of likely duplicates found", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
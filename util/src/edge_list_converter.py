@@ -0,0 +1,188 @@
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+# (first vertex, second vertex, position in the source, direction, sign)
+_RECORD = struct.Struct('<qqqbb')
+_RECORDS_PER_READ = 65536
+
+MergePolicy = Callable[[Optional[int], Optional[int]], Optional[int]]
+
+
+def agreement_merge_policy(forward: Optional[int], backward: Optional[int]) -> Optional[int]:
+    """
+    Merge policy described in the README for the wikipedia dataset: if both directions agree or only one exists, the
+    edge takes that sign, and if they disagree there is no edge.
+    :param forward: Sign of the edge from the smaller to the larger vertex, or None if there is no such edge
+    :param backward: Sign of the edge from the larger to the smaller vertex, or None if there is no such edge
+    :return: Sign of the undirected edge, or None to leave the pair without an edge
+    """
+    if forward is None:
+        return backward
+    if backward is None or forward == backward:
+        return forward
+    return None
+
+
+def negative_merge_policy(forward: Optional[int], backward: Optional[int]) -> Optional[int]:
+    """
+    Merge policy in which a negative sign in any direction makes the edge negative.
+    """
+    return -1 if -1 in (forward, backward) else 1
+
+
+def positive_merge_policy(forward: Optional[int], backward: Optional[int]) -> Optional[int]:
+    """
+    Merge policy in which a positive sign in any direction makes the edge positive.
+    """
+    return 1 if 1 in (forward, backward) else -1
+
+
+class EdgeListConverter:
+    """
+    EdgeListConverter
+    =================
+
+    :class:`EdgeListConverter` converts a directed signed edge list, as the SNAP dumps, into an undirected dataset in
+    the format described in the README, without loading the graph in memory.
+
+    The edges are read as a stream and normalized to ``(min(u, v), max(u, v))``. They are sorted by an external merge
+    sort: chunks of at most ``chunk_size`` edges are sorted in memory and spilled to temporary files, which are then
+    merged. Consecutive edges of the merged stream between the same pair of vertices are combined into one undirected
+    edge by the merge policy, which receives the sign of each direction (the last one in the source if a direction is
+    repeated). The vertices are shifted so that the smallest id becomes 1, so the ids of the source are expected to be
+    consecutive integers, as in the SNAP dumps.
+
+    Lines that are empty or start with ``#`` or ``%`` are skipped. The first three columns of the other lines are the
+    source vertex, the destination vertex and the weight, and any other column (e.g. a timestamp) is ignored. Only the
+    sign of the weight is kept, and self-loops and edges with weight 0 are dropped.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            converter = EdgeListConverter(chunk_size=5000000, merge_policy=agreement_merge_policy)
+            num_vertices, num_edges = converter.convert('../original/soc-sign-epinions.txt', '../dataset/soc-sign-epinions.txt')
+    """
+
+    def __init__(self, chunk_size: int = 1000000, merge_policy: MergePolicy = agreement_merge_policy,
+                 temporary_directory: str = None):
+        """
+        :param chunk_size: Maximum number of edges kept in memory before spilling them to a temporary file
+        :param merge_policy: Function that receives the sign of both directions of a pair of vertices (None if the
+        direction does not exist) and returns the sign of the undirected edge, or None to drop it
+        :param temporary_directory: Directory for the spill files. Defaults to the system temporary directory
+        """
+        self._chunk_size: int = chunk_size
+        self._merge_policy: MergePolicy = merge_policy
+        self._temporary_directory: str = temporary_directory
+
+    def convert(self, source_path: str, destination_path: str) -> Tuple[int, int]:
+        """
+        Converts a directed signed edge list into an undirected dataset.
+        :param source_path: Path to the directed edge list
+        :param destination_path: Path to the undirected dataset to write
+        :return: Tuple with the number of vertices and the number of edges of the dataset
+        """
+        with tempfile.TemporaryDirectory(dir=self._temporary_directory) as spill_directory:
+            spill_paths, min_vertex, max_vertex = self.__spill_sorted_chunks(source_path, spill_directory)
+            if min_vertex is None:
+                min_vertex, max_vertex = 1, 0
+            offset = 1 - min_vertex
+            body_path = os.path.join(spill_directory, 'body')
+            num_edges = 0
+            spill_files = [open(path, 'rb') for path in spill_paths]
+            try:
+                with open(body_path, 'w') as body:
+                    for u, v, sign in self.__merge(heapq.merge(*[_read_records(file) for file in spill_files])):
+                        body.write(f"{u + offset} {v + offset} {sign}\n")
+                        num_edges += 1
+            finally:
+                for file in spill_files:
+                    file.close()
+
+            num_vertices = max_vertex - min_vertex + 1
+            directory = os.path.dirname(destination_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(destination_path, 'w') as destination, open(body_path, 'r') as body:
+                destination.write(f"{num_vertices} {num_edges}\n")
+                shutil.copyfileobj(body, destination)
+        return num_vertices, num_edges
+
+    def __spill_sorted_chunks(self, source_path: str, spill_directory: str) -> Tuple[List[str], int, int]:
+        """
+        Reads the source and writes it to sorted spill files of at most ``chunk_size`` edges.
+        :return: Tuple with the paths of the spill files and the smallest and largest vertex ids (None if there are no edges)
+        """
+        spill_paths = []
+        chunk = []
+        min_vertex = max_vertex = None
+        with open(source_path, 'r', errors='ignore') as source:
+            for position, line in enumerate(source):
+                if not line.strip() or line[0] in '#%':
+                    continue
+                u, v, weight = line.split()[:3]
+                u, v, weight = int(u), int(v), float(weight)
+                if u == v or weight == 0:
+                    continue
+                if min_vertex is None:
+                    min_vertex, max_vertex = min(u, v), max(u, v)
+                else:
+                    min_vertex, max_vertex = min(min_vertex, u, v), max(max_vertex, u, v)
+                chunk.append((min(u, v), max(u, v), position, 0 if u < v else 1, 1 if weight > 0 else -1))
+                if len(chunk) >= self._chunk_size:
+                    spill_paths.append(_write_chunk(chunk, spill_directory, len(spill_paths)))
+                    chunk = []
+        if chunk:
+            spill_paths.append(_write_chunk(chunk, spill_directory, len(spill_paths)))
+        return spill_paths, min_vertex, max_vertex
+
+    def __merge(self, records: Iterator[Tuple[int, int, int, int, int]]) -> Iterator[Tuple[int, int, int]]:
+        """
+        Combines the sorted records of each pair of vertices into one undirected edge with the merge policy.
+        :return: Iterator of the undirected edges, sorted by their vertices
+        """
+        pair = None
+        signs: List[Optional[int]] = [None, None]
+        for u, v, _, direction, sign in records:
+            if (u, v) != pair:
+                if pair is not None:
+                    merged = self._merge_policy(signs[0], signs[1])
+                    if merged is not None:
+                        yield pair[0], pair[1], merged
+                pair = (u, v)
+                signs = [None, None]
+            # the records are sorted by position, so the last edge of each direction wins
+            signs[direction] = sign
+        if pair is not None:
+            merged = self._merge_policy(signs[0], signs[1])
+            if merged is not None:
+                yield pair[0], pair[1], merged
+
+
+def _write_chunk(chunk: List[Tuple[int, int, int, int, int]], spill_directory: str, index: int) -> str:
+    """
+    Sorts a chunk of records and writes it to a spill file.
+    :return: Path of the spill file
+    """
+    chunk.sort()
+    path = os.path.join(spill_directory, f'chunk-{index}')
+    with open(path, 'wb') as file:
+        for start in range(0, len(chunk), _RECORDS_PER_READ):
+            file.write(b''.join(_RECORD.pack(*record) for record in chunk[start:start + _RECORDS_PER_READ]))
+    return path
+
+
+def _read_records(file: BinaryIO) -> Iterator[Tuple[int, int, int, int, int]]:
+    """
+    Reads the records of a spill file in blocks.
+    """
+    while True:
+        block = file.read(_RECORD.size * _RECORDS_PER_READ)
+        if not block:
+            return
+        yield from _RECORD.iter_unpack(block)
@@ -0,0 +1,315 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from util.src.graph import Graph
+
+_MAGIC = b'SGARCH01'
+# offset and length of the index, followed by the magic bytes
+_FOOTER = struct.Struct('<QQ8s')
+# lengths of the sections of a sparse instance: row counts, column deltas and signs
+_SPARSE_HEADER = struct.Struct('<QQQ')
+
+COMPLETE = 'complete'
+SPARSE = 'sparse'
+
+
+class GraphArchiveWriter:
+    """
+    GraphArchiveWriter
+    ==================
+
+    :class:`GraphArchiveWriter` stores many signed graphs with vertices from 1 to V and weights -1 or 1 in a single
+    compressed archive, which can be read back with :class:`GraphArchiveReader`.
+
+    Each graph is stored as a zlib compressed block:
+
+    - Complete graphs only store the signs of the edges, as a bitmap of one bit per pair of vertices, in lexicographic
+      order of the pairs.
+    - Other graphs store their edges as ``(min(u, v), max(u, v))`` pairs sorted by vertex: the number of edges of each
+      vertex, the gap between consecutive neighbors, and a bitmap with the signs. The counts and gaps are varint encoded,
+      so most of them take a single byte.
+
+    The archive ends with an index of the graphs, so any graph can be read without reading the others. The edge set
+    and the signs are preserved, but not the order of the edges, which vertex of an edge comes first, nor the comment
+    lines of the text files.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            with GraphArchiveWriter('complete.sga') as archive:
+                archive.add_file('datasets/complete/complete_001_10x45_100_20.txt', 'complete_001_10x45_100_20')
+                archive.add(graph)
+    """
+
+    def __init__(self, path: str):
+        """
+        Creates the archive, overwriting any existing file.
+        :param path: Path of the archive
+        """
+        self._file = open(path, 'wb')
+        self._file.write(_MAGIC)
+        self._index: Dict[str, Dict[str, int]] = {}
+
+    def add(self, graph: Graph, name: str = None):
+        """
+        Adds a graph to the archive.
+        :param graph: The graph. Its vertices must go from 1 to V and its weights must be -1 or 1
+        :param name: Name of the graph in the archive. Defaults to the name of the graph
+        """
+        name = graph.get_name() if name is None else name
+        if name in self._index:
+            raise ValueError(f"The archive already contains a graph named {name}")
+        num_vertices = len(graph.get_vertices())
+        u, v, weights = graph.get_edge_arrays()
+        if np.any((weights != 1) & (weights != -1)):
+            raise ValueError(f"The graph {name} has weights other than -1 and 1")
+        first, second = np.minimum(u, v), np.maximum(u, v)
+        order = np.lexsort((second, first))
+        first, second, positive = first[order], second[order], weights[order] > 0
+
+        num_pairs = num_vertices * (num_vertices - 1) // 2
+        complete_first, complete_second = np.triu_indices(num_vertices, k=1) if len(u) == num_pairs else (None, None)
+        if complete_first is not None and np.array_equal(first, complete_first) \
+                and np.array_equal(second, complete_second):
+            kind = COMPLETE
+            payload = np.packbits(positive).tobytes()
+        else:
+            kind = SPARSE
+            counts = np.bincount(first, minlength=num_vertices)
+            # gap to the previous neighbor of the same vertex, or to the vertex itself for the first neighbor
+            previous = np.concatenate([[0], second[:-1]])
+            is_first = np.ones(len(first), dtype=bool)
+            is_first[1:] = first[1:] != first[:-1]
+            gaps = second - np.where(is_first, first, previous)
+            encoded_counts, encoded_gaps = _encode_varints(counts), _encode_varints(gaps)
+            signs = np.packbits(positive).tobytes()
+            payload = (_SPARSE_HEADER.pack(len(encoded_counts), len(encoded_gaps), len(signs))
+                       + encoded_counts + encoded_gaps + signs)
+        block = zlib.compress(payload, 9)
+        self._index[name] = {'offset': self._file.tell(), 'length': len(block), 'kind': kind,
+                             'vertices': num_vertices, 'edges': len(u)}
+        self._file.write(block)
+
+    def add_file(self, path: str, name: str = None):
+        """
+        Reads a dataset file and adds its graph to the archive.
+        :param path: Path of the dataset file
+        :param name: Name of the graph in the archive. Defaults to the name of the file
+        """
+        graph = Graph()
+        graph.read_graph_from_file(path)
+        self.add(graph, os.path.basename(path) if name is None else name)
+
+    def close(self):
+        """
+        Writes the index and closes the archive.
+        """
+        if self._file.closed:
+            return
+        index = zlib.compress(json.dumps(self._index).encode())
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(offset, len(index), _MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> 'GraphArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class GraphArchiveReader:
+    """
+    GraphArchiveReader
+    ==================
+
+    :class:`GraphArchiveReader` reads the graphs of an archive written by :class:`GraphArchiveWriter`. Only the index is
+    read when the archive is opened, and each graph is decoded straight into NumPy arrays without going through text.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            with GraphArchiveReader('complete.sga') as archive:
+                for name in archive.get_names():
+                    graph = archive.read(name)
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens an archive and reads its index.
+        :param path: Path of the archive
+        """
+        self._file = open(path, 'rb')
+        if self._file.read(len(_MAGIC)) != _MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a graph archive")
+        self._file.seek(-_FOOTER.size, os.SEEK_END)
+        offset, length, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != _MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a complete graph archive")
+        self._file.seek(offset)
+        self._index: Dict[str, Dict[str, int]] = json.loads(zlib.decompress(self._file.read(length)))
+
+    def get_names(self) -> List[str]:
+        """
+        Returns the names of the graphs in the archive, in the order they were added.
+        """
+        return list(self._index)
+
+    def get_info(self, name: str) -> Dict[str, int]:
+        """
+        Returns the entry of a graph in the index: its kind (complete or sparse), number of vertices and number of
+        edges, and the position of its block in the archive.
+        """
+        return dict(self._index[name])
+
+    def read_arrays(self, name: str) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decodes a graph into arrays.
+        :param name: Name of the graph
+        :return: Tuple with the number of vertices and three arrays with the first endpoint, the second endpoint (both
+        from 0 to V - 1, the first one smaller) and the weight of each edge, sorted by endpoints
+        """
+        entry = self._index[name]
+        self._file.seek(entry['offset'])
+        payload = zlib.decompress(self._file.read(entry['length']))
+        num_vertices, num_edges = entry['vertices'], entry['edges']
+        if entry['kind'] == COMPLETE:
+            first, second = np.triu_indices(num_vertices, k=1)
+            signs = payload
+        else:
+            counts_length, gaps_length, _ = _SPARSE_HEADER.unpack_from(payload)
+            start = _SPARSE_HEADER.size
+            counts = _decode_varints(payload[start:start + counts_length])
+            gaps = _decode_varints(payload[start + counts_length:start + counts_length + gaps_length])
+            signs = payload[start + counts_length + gaps_length:]
+            first = np.repeat(np.arange(num_vertices, dtype=np.int64), counts)
+            # each neighbor is the previous one plus its gap, starting from the vertex itself
+            row_start = np.cumsum(counts) - counts
+            gaps[row_start[counts > 0]] += first[row_start[counts > 0]]
+            second = _segmented_cumsum(gaps, row_start[counts > 0])
+        positive = np.unpackbits(np.frombuffer(signs, dtype=np.uint8), count=num_edges).astype(bool)
+        weights = np.where(positive, 1, -1)
+        return num_vertices, first.astype(np.int64), second.astype(np.int64), weights
+
+    def read(self, name: str) -> Graph:
+        """
+        Decodes a graph.
+        :param name: Name of the graph
+        :return: The graph, with vertices from 1 to V
+        """
+        num_vertices, first, second, weights = self.read_arrays(name)
+        return Graph.from_arrays(name, num_vertices, first, second, weights)
+
+    def close(self):
+        self._file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __enter__(self) -> 'GraphArchiveReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _encode_varints(values: np.ndarray) -> bytes:
+    """
+    Encodes non negative integers as LEB128 varints: 7 bits per byte, with the high bit set on every byte except the
+    last one of each value.
+    """
+    values = values.astype(np.uint64)
+    num_bytes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        num_bytes += values >= (np.uint64(1) << np.uint64(shift))
+    starts = np.cumsum(num_bytes) - num_bytes
+    encoded = np.zeros(int(num_bytes.sum()), dtype=np.uint8)
+    for k in range(int(num_bytes.max(initial=0))):
+        has_byte = num_bytes > k
+        chunk = (values[has_byte] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = np.where(num_bytes[has_byte] > k + 1, 0x80, 0).astype(np.uint64)
+        encoded[starts[has_byte] + k] = (chunk | more).astype(np.uint8)
+    return encoded.tobytes()
+
+
+def _decode_varints(data: bytes) -> np.ndarray:
+    """
+    Decodes LEB128 varints written by ``_encode_varints``.
+    """
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    if len(encoded) == 0:
+        return np.zeros(0, dtype=np.int64)
+    is_last = encoded < 0x80
+    value_start = np.flatnonzero(np.concatenate([[True], is_last[:-1]]))
+    # position of each byte inside its value
+    position = np.arange(len(encoded)) - np.repeat(value_start, np.diff(np.append(value_start, len(encoded))))
+    chunks = (encoded & 0x7F).astype(np.uint64) << (np.uint64(7) * position.astype(np.uint64))
+    return np.add.reduceat(chunks, value_start).astype(np.int64)
+
+
+def _segmented_cumsum(values: np.ndarray, segment_starts: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum of an array that restarts at each segment start.
+    """
+    total = np.cumsum(values)
+    offsets = np.zeros(len(values), dtype=total.dtype)
+    # subtract the running total reached before each segment
+    offsets[segment_starts[1:]] = total[segment_starts[1:] - 1]
+    return total - np.maximum.accumulate(offsets)
+
+
+def main(arguments: List[str]) -> int:
+    usage = ("usage: python -m util.src.graph_archive pack <archive> <file or directory>...\n"
+             "       python -m util.src.graph_archive list <archive>\n"
+             "       python -m util.src.graph_archive extract <archive> <destination directory> [<name>...]")
+    if len(arguments) < 2 or arguments[0] not in ('pack', 'list', 'extract'):
+        print(usage, file=sys.stderr)
+        return 2
+    command, archive_path = arguments[0], arguments[1]
+    status = 0
+    if command == 'pack':
+        with GraphArchiveWriter(archive_path) as archive:
+            for source in arguments[2:]:
+                if os.path.isdir(source):
+                    root = os.path.dirname(os.path.normpath(source))
+                    paths = [os.path.join(directory, file_name)
+                             for directory, _, file_names in sorted(os.walk(source)) for file_name in sorted(file_names)]
+                else:
+                    root, paths = os.path.dirname(source), [source]
+                for path in paths:
+                    try:
+                        archive.add_file(path, os.path.relpath(path, root or '.'))
+                    except ValueError as error:
+                        # files that cannot be stored (e.g. weights other than -1 and 1) are skipped
+                        print(f"{path}: {error}", file=sys.stderr)
+                        status = 1
+    elif command == 'list':
+        with GraphArchiveReader(archive_path) as archive:
+            for name in archive.get_names():
+                info = archive.get_info(name)
+                print(f"{name}\t{info['kind']}\t{info['vertices']}\t{info['edges']}\t{info['length']}")
+    else:
+        if len(arguments) < 3:
+            print(usage, file=sys.stderr)
+            return 2
+        destination = arguments[2]
+        with GraphArchiveReader(archive_path) as archive:
+            for name in arguments[3:] or archive.get_names():
+                path = os.path.join(destination, name)
+                archive.read(name).save_graph_to_file(os.path.dirname(path) + os.sep, os.path.basename(path))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
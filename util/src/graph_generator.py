@@ -0,0 +1,158 @@
+from typing import Tuple
+
+import numpy as np
+
+from util.src.graph import Graph
+
+
+class GraphGenerator:
+    """
+    GraphGenerator
+    ==============
+
+    :class:`GraphGenerator` builds the synthetic signed graph families shipped under ``datasets/``: complete graphs,
+    random graphs and interval graphs. The edges are generated with NumPy arrays, so the cost is proportional to the
+    number of edges of the graph and not to the number of pairs of vertices.
+
+    Initialization
+    --------------
+        .. code-block:: python
+
+            generator = GraphGenerator(seed=42)
+
+        - The ``seed`` parameter is optional. Two generators with the same seed produce the same graphs when called in
+          the same order.
+
+    Methods
+    -------
+        .. code-block:: python
+
+            generator.complete(num_vertices: int, positive_percentage: float) -> Graph
+            generator.random(num_vertices: int, density: float, positive_percentage: float, exact_edge_count: bool = True) -> Graph
+            generator.interval(num_vertices: int, density: float, positive_percentage: float) -> Graph
+
+        ``density`` and ``positive_percentage`` are percentages between 0 and 100. Every edge is positive with
+        probability ``positive_percentage / 100`` and negative otherwise. The vertices go from 1 to ``num_vertices``
+        and every edge ``(u, v, weight)`` has ``u < v``.
+
+        If no name is given, the graphs are named ``<family>_<V>x<E>_<density>_<negative_percentage>``, which is the
+        naming of the files under ``datasets/`` without the instance index, e.g. ``complete_230x26335_100_80``.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            generator = GraphGenerator(seed=7)
+            graph = generator.random(100000, 0.01, 50)
+            graph.save_graph_to_file('../dataset/')
+    """
+
+    def __init__(self, seed: int = None):
+        """
+        Initializes a new generator.
+
+        :param seed: Seed of the random number generator.
+        :type seed: int
+        """
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+
+    def complete(self, num_vertices: int, positive_percentage: float, name: str = None) -> Graph:
+        """
+        Generates a complete signed graph.
+        :param num_vertices: Number of vertices of the graph.
+        :param positive_percentage: Percentage of positive edges, between 0 and 100.
+        :param name: Name of the graph. If it is None, the name follows the naming of ``datasets/complete``.
+        :return: The generated graph.
+        """
+        u, v = np.triu_indices(num_vertices, k=1)
+        return self.__build_graph("complete", name, num_vertices, 100, positive_percentage, u + 1, v + 1)
+
+    def random(self, num_vertices: int, density: float, positive_percentage: float,
+               exact_edge_count: bool = True, name: str = None) -> Graph:
+        """
+        Generates a random signed graph in which all the sets of edges of the same size are equally likely.
+        :param num_vertices: Number of vertices of the graph.
+        :param density: Percentage of the pairs of vertices that are joined by an edge, between 0 and 100.
+        :param positive_percentage: Percentage of positive edges, between 0 and 100.
+        :param exact_edge_count: If True, the graph has exactly ``round(density / 100 * V * (V - 1) / 2)`` edges, as the
+        graphs in ``datasets/random-graphs``. If False, the number of edges is drawn from a binomial distribution, so the
+        graph follows the G(n, p) model with ``p = density / 100``.
+        :param name: Name of the graph. If it is None, the name follows the naming of ``datasets/random-graphs``.
+        :return: The generated graph.
+        """
+        num_pairs = num_vertices * (num_vertices - 1) // 2
+        if exact_edge_count:
+            num_edges = int(round(density / 100 * num_pairs))
+        else:
+            num_edges = int(self._rng.binomial(num_pairs, density / 100))
+        pair_indices = np.sort(self._rng.choice(num_pairs, size=num_edges, replace=False))
+        u, v = _pair_from_index(pair_indices, num_vertices)
+        return self.__build_graph("random", name, num_vertices, density, positive_percentage, u + 1, v + 1)
+
+    def interval(self, num_vertices: int, density: float, positive_percentage: float, name: str = None) -> Graph:
+        """
+        Generates a random signed interval graph. Each vertex is an interval of the same length with its left end drawn
+        uniformly from [0, 1), and two vertices are adjacent when their intervals overlap. The length is chosen so that
+        the expected density is ``density`` (ignoring the intervals that stick out of [0, 1)).
+        :param num_vertices: Number of vertices of the graph.
+        :param density: Expected percentage of the pairs of vertices that are joined by an edge, between 0 and 100.
+        :param positive_percentage: Percentage of positive edges, between 0 and 100.
+        :param name: Name of the graph. If it is None, the name follows the naming of ``datasets/interval-graphs``.
+        :return: The generated graph.
+        """
+        # two intervals of length L overlap with probability 1 - (1 - L)^2
+        length = 1 - np.sqrt(1 - min(density, 100) / 100)
+        left_ends = self._rng.random(num_vertices)
+        order = np.argsort(left_ends)
+        sorted_left_ends = left_ends[order]
+        # the interval at sorted position p overlaps the ones at positions p + 1, ..., last[p] - 1
+        last = np.searchsorted(sorted_left_ends, sorted_left_ends + length, side='right')
+        counts = last - np.arange(1, num_vertices + 1)
+        first_edge = np.cumsum(counts) - counts
+        source = np.repeat(np.arange(num_vertices), counts)
+        target = np.arange(counts.sum()) - np.repeat(first_edge, counts) + source + 1
+        source, target = order[source] + 1, order[target] + 1
+        u, v = np.minimum(source, target), np.maximum(source, target)
+        edge_order = np.lexsort((v, u))
+        return self.__build_graph("interval", name, num_vertices, density, positive_percentage,
+                                  u[edge_order], v[edge_order])
+
+    def __build_graph(self, family: str, name: str, num_vertices: int, density: float, positive_percentage: float,
+                      u: np.ndarray, v: np.ndarray) -> Graph:
+        """
+        Draws the signs of the edges and builds the graph.
+        :param family: Family of the graph, used in the default name.
+        :param name: Name of the graph, or None to use the default name.
+        :param num_vertices: Number of vertices of the graph.
+        :param density: Density used to generate the graph, used in the default name.
+        :param positive_percentage: Percentage of positive edges.
+        :param u: First endpoint of each edge.
+        :param v: Second endpoint of each edge.
+        :return: The generated graph.
+        """
+        weights = np.where(self._rng.random(len(u)) < positive_percentage / 100, 1, -1)
+        if name is None:
+            name = f"{family}_{num_vertices}x{len(u)}_{density:g}_{100 - positive_percentage:g}"
+        return Graph.from_arrays(name, num_vertices, u - 1, v - 1, weights)
+
+
+def _pair_from_index(index: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts indices of the pairs ``(i, j)``, ``0 <= i < j < num_vertices``, enumerated in lexicographic order, back
+    into the pairs.
+    :param index: Indices of the pairs, between 0 and ``num_vertices * (num_vertices - 1) / 2 - 1``.
+    :param num_vertices: Number of vertices.
+    :return: Two arrays with the first and the second element of each pair.
+    """
+    index = index.astype(np.int64)
+
+    def row_start(row):
+        return row * (2 * num_vertices - row - 1) // 2
+
+    b = 2 * num_vertices - 1
+    row = ((b - np.sqrt(b * b - 8.0 * index)) // 2).astype(np.int64)
+    # fix the rows that are off by one due to floating point rounding
+    row -= row_start(row) > index
+    row += row_start(row + 1) <= index
+    column = index - row_start(row) + row + 1
+    return row, column
@@ -0,0 +1,199 @@
+import random
+from collections import deque
+from typing import Callable, List, Set, Union
+
+from util.src.graph import Graph
+from util.src.instrumentation import instrumented
+
+
+class GraphSampler:
+    """
+    GraphSampler
+    ============
+
+    :class:`GraphSampler` extracts induced subgraphs of a :class:`Graph` with a target number of vertices. Every
+    sampler only walks the adjacency list of the vertices it reaches, so the cost of a sample is proportional to the
+    sampled neighborhood and not to the size of the parent graph.
+
+    Initialization
+    --------------
+        .. code-block:: python
+
+            sampler = GraphSampler(graph, rng=random.Random(42))
+
+        - The ``graph`` parameter is the graph to sample from.
+        - The ``rng`` parameter is optional. It is the random number generator used by every sampler. If it is None,
+          a ``random.Random(42)`` is used, so the samples are reproducible by default.
+
+    Methods
+    -------
+        .. code-block:: python
+
+            sampler.snowball(num_vertices: int) -> Graph
+            sampler.random_walk(num_vertices: int, restart_probability: float = 0.15) -> Graph
+            sampler.forest_fire(num_vertices: int, burning_probability: float = 0.7) -> Graph
+
+        snowball(num_vertices)
+            Breadth first search from a random seed vertex.
+
+        random_walk(num_vertices, restart_probability)
+            Random walk that jumps back to its seed vertex with the given probability.
+
+        forest_fire(num_vertices, burning_probability)
+            Forest fire sampling, each burned vertex burns a geometrically distributed number of its neighbors.
+
+        When the reached component is exhausted before ``num_vertices`` vertices are sampled, all samplers continue
+        from a new random seed vertex. The name of the sampled graph is the number of vertices followed by the name
+        of the parent graph, as in :meth:`Graph.generate_subgraph`.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            sampler = GraphSampler(graph, rng=random.Random(7))
+            subgraph = sampler.snowball(50000)
+            subgraph, _, _ = subgraph.generate_numeric_graph()
+    """
+
+    # Number of random draws used to find an unsampled seed vertex before falling back to a linear scan
+    _SEED_ATTEMPTS = 32
+    # Number of steps without a new vertex, per vertex reached from the seed, after which a random walk is stuck
+    _STUCK_STEPS_PER_VERTEX = 10
+
+    def __init__(self, graph: Graph, rng: random.Random = None):
+        """
+        Initializes a new sampler over the given graph.
+
+        :param graph: The graph to sample from.
+        :type graph: Graph
+        :param rng: The random number generator. Defaults to ``random.Random(42)``.
+        :type rng: random.Random
+        """
+        self._graph: Graph = graph
+        self._rng: random.Random = rng if rng is not None else random.Random(42)
+
+    @instrumented("sample")
+    def snowball(self, num_vertices: int) -> Graph:
+        """
+        Samples the graph with a breadth first search from a random seed vertex.
+        :param num_vertices: Number of vertices of the sample. If the graph has fewer vertices, all of them are sampled.
+        :return: The subgraph induced by the sampled vertices.
+        """
+
+        def expand(seed: Union[str, int], sampled: List[Union[str, int]], visited: Set[Union[str, int]]):
+            queue = deque([seed])
+            while queue and len(sampled) < num_vertices:
+                vertex = queue.popleft()
+                for neighbor, _ in self._graph.get_adjacent_vertices(vertex):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        sampled.append(neighbor)
+                        queue.append(neighbor)
+                        if len(sampled) >= num_vertices:
+                            break
+
+        return self.__sample(num_vertices, expand)
+
+    @instrumented("sample")
+    def random_walk(self, num_vertices: int, restart_probability: float = 0.15) -> Graph:
+        """
+        Samples the graph with a random walk with restart. At each step the walk goes back to its seed vertex with
+        probability ``restart_probability`` and otherwise moves to a random neighbor. If the walk does not find a new
+        vertex in ``10`` steps per vertex it has reached, it is considered stuck (its component may be exhausted, or
+        the rest of it may be too far from the seed) and a new seed vertex is drawn.
+        :param num_vertices: Number of vertices of the sample. If the graph has fewer vertices, all of them are sampled.
+        :param restart_probability: Probability of jumping back to the seed vertex at each step.
+        :return: The subgraph induced by the sampled vertices.
+        """
+
+        def expand(seed: Union[str, int], sampled: List[Union[str, int]], visited: Set[Union[str, int]]):
+            vertex = seed
+            reached = 1
+            steps_without_progress = 0
+            while len(sampled) < num_vertices and steps_without_progress < self._STUCK_STEPS_PER_VERTEX * reached:
+                neighbors = self._graph.get_adjacent_vertices(vertex)
+                if not neighbors:
+                    return
+                if self._rng.random() < restart_probability:
+                    vertex = seed
+                else:
+                    vertex = neighbors[self._rng.randrange(len(neighbors))][0]
+                if vertex in visited:
+                    steps_without_progress += 1
+                else:
+                    visited.add(vertex)
+                    sampled.append(vertex)
+                    reached += 1
+                    steps_without_progress = 0
+
+        return self.__sample(num_vertices, expand)
+
+    @instrumented("sample")
+    def forest_fire(self, num_vertices: int, burning_probability: float = 0.7) -> Graph:
+        """
+        Samples the graph with forest fire sampling. Each burned vertex burns ``x`` of its unburned neighbors, chosen
+        at random, where ``x`` follows a geometric distribution with mean ``p / (1 - p)``.
+        :param num_vertices: Number of vertices of the sample. If the graph has fewer vertices, all of them are sampled.
+        :param burning_probability: The forward burning probability ``p``. It must be in [0, 1).
+        :return: The subgraph induced by the sampled vertices.
+        """
+        if not 0 <= burning_probability < 1:
+            raise ValueError(f"The burning probability must be in [0, 1), got {burning_probability}")
+
+        def expand(seed: Union[str, int], sampled: List[Union[str, int]], visited: Set[Union[str, int]]):
+            queue = deque([seed])
+            while queue and len(sampled) < num_vertices:
+                vertex = queue.popleft()
+                burned = 0
+                while self._rng.random() < burning_probability:
+                    burned += 1
+                candidates = [neighbor for neighbor, _ in self._graph.get_adjacent_vertices(vertex)
+                              if neighbor not in visited]
+                if burned < len(candidates):
+                    candidates = self._rng.sample(candidates, burned)
+                for neighbor in candidates:
+                    # parallel edges may list the same neighbor twice
+                    if neighbor in visited:
+                        continue
+                    visited.add(neighbor)
+                    sampled.append(neighbor)
+                    queue.append(neighbor)
+                    if len(sampled) >= num_vertices:
+                        break
+
+        return self.__sample(num_vertices, expand)
+
+    def __sample(self, num_vertices: int,
+                 expand: Callable[[Union[str, int], List[Union[str, int]], Set[Union[str, int]]], None]) -> Graph:
+        """
+        Draws seed vertices and expands them until the sample has the requested number of vertices.
+        :param num_vertices: Number of vertices of the sample.
+        :param expand: Function that grows the sample from a seed vertex. It receives the seed, the list of sampled
+        vertices and the set of sampled vertices, and must append the new vertices to both of them.
+        :return: The subgraph induced by the sampled vertices.
+        """
+        name = str(num_vertices) + self._graph.get_name()
+        num_vertices = min(num_vertices, len(self._graph.get_vertices()))
+        sampled: List[Union[str, int]] = []
+        visited: Set[Union[str, int]] = set()
+        while len(sampled) < num_vertices:
+            seed = self.__random_unsampled_vertex(visited)
+            visited.add(seed)
+            sampled.append(seed)
+            expand(seed, sampled, visited)
+        return self._graph.induced_subgraph(sampled, name=name)
+
+    def __random_unsampled_vertex(self, visited: Set[Union[str, int]]) -> Union[str, int]:
+        """
+        Returns a random vertex that has not been sampled yet.
+        :param visited: The set of sampled vertices. It must not contain every vertex of the graph.
+        :return: A vertex of the graph that is not in ``visited``.
+        """
+        vertices = self._graph.get_vertices()
+        for _ in range(self._SEED_ATTEMPTS):
+            vertex = vertices[self._rng.randrange(len(vertices))]
+            if vertex not in visited:
+                return vertex
+        # the sample covers most of the graph, pick uniformly among the remaining vertices
+        remaining = [vertex for vertex in vertices if vertex not in visited]
+        return remaining[self._rng.randrange(len(remaining))]
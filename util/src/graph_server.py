@@ -0,0 +1,465 @@
+import asyncio
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from util.src.graph import Graph, read_edge_arrays
+
+# largest request line accepted by the server
+_LINE_LIMIT = 1 << 26
+
+
+class CompactGraph:
+    """
+    CompactGraph
+    ============
+
+    :class:`CompactGraph` is a read-only signed graph with vertices from 1 to V stored as NumPy arrays in compressed
+    sparse row form: the neighbors and signs of every vertex are stored next to each other, so the degrees and
+    neighborhoods of many vertices are answered with a few array operations. It takes about 9 bytes per edge and
+    direction, instead of the hundreds of bytes per edge of the lists and dictionaries of :class:`Graph`.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            graph = CompactGraph.from_graph(graph)
+            degrees, positive, negative = graph.degrees([1, 2, 3])
+    """
+
+    def __init__(self, name: str, num_vertices: int, u: np.ndarray, v: np.ndarray, weights: np.ndarray):
+        """
+        :param name: Name of the graph
+        :param num_vertices: Number of vertices
+        :param u: Array with the first endpoint of each edge, from 0 to ``num_vertices - 1``
+        :param v: Array with the second endpoint of each edge, from 0 to ``num_vertices - 1``
+        :param weights: Array with the weight of each edge. Only its sign is kept.
+        """
+        self.name: str = name
+        self.num_vertices: int = num_vertices
+        self.num_edges: int = len(u)
+        self.num_positive_edges: int = int(np.count_nonzero(weights > 0))
+        self.fingerprint: str = Graph.fingerprint_arrays(num_vertices, u, v, weights)
+        source, target = np.concatenate([u, v]), np.concatenate([v, u])
+        signs = np.sign(np.concatenate([weights, weights])).astype(np.int8)
+        # the neighbors of each vertex are sorted, and the two copies of a self-loop are next to each other
+        order = np.lexsort((signs, target, source))
+        self._neighbors: np.ndarray = target[order].astype(np.int32)
+        self._signs: np.ndarray = signs[order]
+        self._row_start: np.ndarray = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=num_vertices), out=self._row_start[1:])
+        # a self-loop counts as one edge of its vertex, as in Graph.get_degree
+        endpoints = np.concatenate([u, v[u != v]])
+        positive = np.concatenate([weights > 0, (weights > 0)[u != v]])
+        self._degrees: np.ndarray = np.bincount(endpoints, minlength=num_vertices).astype(np.int32)
+        self._positive_degrees: np.ndarray = np.bincount(endpoints[positive], minlength=num_vertices).astype(np.int32)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CompactGraph':
+        """
+        Creates a compact copy of a graph. The vertices are numbered by their position in ``graph.get_vertices()``,
+        starting at 1.
+        """
+        u, v, weights = graph.get_edge_arrays()
+        return cls(graph.get_name(), len(graph.get_vertices()), u, v, weights)
+
+    def nbytes(self) -> int:
+        """
+        Returns the memory used by the arrays of the graph, in bytes.
+        """
+        return (self._neighbors.nbytes + self._signs.nbytes + self._row_start.nbytes + self._degrees.nbytes
+                + self._positive_degrees.nbytes)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the size of the graph, its number of edges of each sign, its maximum degree, its density and its
+        fingerprint (see ``Graph.fingerprint``).
+        """
+        pairs = self.num_vertices * (self.num_vertices - 1) // 2
+        return {
+            'name': self.name,
+            'vertices': self.num_vertices,
+            'edges': self.num_edges,
+            'positive_edges': self.num_positive_edges,
+            'negative_edges': self.num_edges - self.num_positive_edges,
+            'max_degree': int(self._degrees.max(initial=0)),
+            'density': self.num_edges / pairs if pairs else 0.0,
+            'fingerprint': self.fingerprint,
+            'bytes': self.nbytes(),
+        }
+
+    def degrees(self, vertices: List[int]) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Returns the degrees of some vertices. A self-loop counts once, as in ``Graph.get_degree``.
+        :param vertices: Vertices, from 1 to V
+        :return: Tuple with the lists of degrees, positive degrees and negative degrees of the vertices
+        """
+        rows = self.__rows(vertices)
+        degrees = self._degrees[rows].astype(np.int64)
+        positive = self._positive_degrees[rows].astype(np.int64)
+        return degrees.tolist(), positive.tolist(), (degrees - positive).tolist()
+
+    def neighbors(self, vertices: List[int]) -> List[List[Tuple[int, int]]]:
+        """
+        Returns the neighborhoods of some vertices.
+        :param vertices: Vertices, from 1 to V
+        :return: List with the list of (neighbor, sign) of each vertex, sorted by neighbor
+        """
+        rows = self.__rows(vertices)
+        neighbors, signs = (self._neighbors + 1).tolist(), self._signs.tolist()
+        return [list(zip(neighbors[start:end], signs[start:end]))
+                for start, end in zip(self._row_start[rows].tolist(), self._row_start[rows + 1].tolist())]
+
+    def subgraph(self, vertices: List[int]) -> List[Tuple[int, int, int]]:
+        """
+        Returns the edges of the subgraph induced by some vertices.
+        :param vertices: Vertices, from 1 to V
+        :return: List with the (u, v, sign) of the edges between the vertices, with u <= v and the original ids
+        """
+        rows = np.unique(self.__rows(vertices))
+        starts, ends = self._row_start[rows], self._row_start[rows + 1]
+        lengths = ends - starts
+        # positions of the edges of all the rows, without a loop over the rows
+        positions = np.repeat(ends - np.cumsum(lengths), lengths) + np.arange(int(lengths.sum()))
+        sources = np.repeat(rows, lengths)
+        targets = self._neighbors[positions]
+        selected = np.zeros(self.num_vertices, dtype=bool)
+        selected[rows] = True
+        # each edge is stored in both directions, keep it once (a self-loop is stored twice in the same row)
+        keep = selected[targets] & (sources < targets)
+        loops = np.flatnonzero(sources == targets)
+        keep[loops[::2]] = True
+        signs = self._signs[positions[keep]]
+        return list(zip((sources[keep] + 1).tolist(), (targets[keep] + 1).tolist(), signs.tolist()))
+
+    def __rows(self, vertices: List[int]) -> np.ndarray:
+        """
+        Converts vertex ids from 1 to V into row numbers, checking that they exist.
+        """
+        rows = np.asarray(vertices, dtype=np.int64).reshape(-1) - 1
+        if len(rows) and (rows.min() < 0 or rows.max() >= self.num_vertices):
+            raise ValueError(f"The vertices must be between 1 and {self.num_vertices}")
+        return rows
+
+
+class GraphServer:
+    """
+    GraphServer
+    ===========
+
+    :class:`GraphServer` is a local asyncio server that keeps the graphs of dataset files in memory, so that several
+    jobs can query the same large graph without reading it again. It listens on a Unix socket or on a TCP port of
+    ``127.0.0.1``.
+
+    The graphs are loaded the first time they are queried, and kept as :class:`CompactGraph` objects in a least
+    recently used cache bounded by a number of graphs and, optionally, by their memory. A graph is reloaded if its file
+    has changed. Text dataset files are parsed straight into arrays, and graphs of an archive written by
+    :class:`GraphArchiveWriter` are decoded from it.
+
+    The protocol is one JSON object per line in both directions. Each request has an ``op``, the ``path`` of the
+    dataset file (plus the ``name`` of the graph, for archives) and the arguments of the operation, and each response
+    has either a ``result`` or an ``error``. An ``id`` in the request is copied to the response. The operations are:
+
+    - ``ping``: returns ``"pong"``.
+    - ``load`` and ``stats``: load the graph if needed and return ``CompactGraph.stats``.
+    - ``degrees``: the degrees of a list of ``vertices``, as lists ``degree``, ``positive`` and ``negative``.
+    - ``neighbors``: the lists of ``[neighbor, sign]`` of a list of ``vertices``.
+    - ``subgraph``: the ``[u, v, sign]`` edges induced by a list of ``vertices``.
+    - ``cache``: the graphs in the cache.
+    - ``evict``: removes a graph from the cache.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            GraphServer(max_graphs=4).run(socket_path='/tmp/graphs.sock')
+
+        Or as a script:
+
+        .. code-block:: bash
+
+            python -m util.src.graph_server /tmp/graphs.sock
+            python -m util.src.graph_server 127.0.0.1:8765
+    """
+
+    def __init__(self, max_graphs: int = 8, max_bytes: int = None):
+        """
+        :param max_graphs: Maximum number of graphs kept in memory
+        :param max_bytes: Maximum memory of the graphs kept in memory, in bytes. The most recently used graph is always
+        kept, even if it is larger.
+        """
+        self._max_graphs: int = max_graphs
+        self._max_bytes: int = max_bytes
+        self._cache: 'OrderedDict[Tuple[str, str], Tuple[float, CompactGraph]]' = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        # one lock per graph being loaded, so a graph requested by several clients at once is loaded once
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def get_graph(self, path: str, name: str = None) -> CompactGraph:
+        """
+        Returns a graph from the cache, loading it if it is not there or if its file has changed.
+        :param path: Path of a dataset file or of a graph archive
+        :param name: Name of the graph in the archive. Must be None for dataset files
+        :return: The graph
+        """
+        key = (os.path.realpath(path), name or '')
+        modified = os.path.getmtime(key[0])
+        with self._lock:
+            cached = self.__lookup(key, modified)
+            if cached is not None:
+                return cached
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            with self._lock:
+                cached = self.__lookup(key, modified)
+                if cached is not None:
+                    return cached
+            graph = _load_graph(path, name)
+            with self._lock:
+                self._cache[key] = (modified, graph)
+                self.__shrink()
+                self._loading.pop(key, None)
+        return graph
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answers one request of the protocol.
+        :param request: The request
+        :return: The response
+        """
+        if not isinstance(request, dict):
+            return {'error': "Invalid request: it must be a JSON object"}
+        response: Dict[str, Any] = {'id': request['id']} if 'id' in request else {}
+        try:
+            response['result'] = self.__answer(request)
+        except (KeyError, TypeError, ValueError, OSError, zlib.error, struct.error) as error:
+            # a truncated or corrupt graph archive raises zlib.error or struct.error
+            module = type(error).__module__
+            kind = type(error).__name__ if module == 'builtins' else f"{module}.{type(error).__name__}"
+            response['error'] = f"{kind}: {error}"
+        return response
+
+    async def start(self, socket_path: str = None, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        """
+        Starts listening, on a Unix socket if ``socket_path`` is given and on a TCP port otherwise.
+        :param socket_path: Path of the Unix socket
+        :param host: Host of the TCP server. Only local addresses should be used, there is no authentication.
+        :param port: Port of the TCP server. 0 picks a free port, see ``server.sockets[0].getsockname()``
+        :return: The asyncio server
+        """
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            return await asyncio.start_unix_server(self.__serve_connection, path=socket_path, limit=_LINE_LIMIT)
+        return await asyncio.start_server(self.__serve_connection, host=host, port=port, limit=_LINE_LIMIT)
+
+    def run(self, socket_path: str = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Starts the server and serves until the process is interrupted. See ``start`` for the parameters.
+        """
+
+        async def serve():
+            server = await self.start(socket_path, host, port)
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(serve())
+
+    def __answer(self, request: Dict[str, Any]) -> Any:
+        operation = request['op']
+        if operation == 'ping':
+            return 'pong'
+        if operation == 'cache':
+            with self._lock:
+                return [{'path': path, 'name': name, 'bytes': graph.nbytes()}
+                        for (path, name), (_, graph) in self._cache.items()]
+        if operation == 'evict':
+            with self._lock:
+                return self._cache.pop((os.path.realpath(request['path']), request.get('name') or ''), None) is not None
+        if operation not in ('load', 'stats', 'degrees', 'neighbors', 'subgraph'):
+            raise ValueError(f"Unknown operation {operation}")
+        graph = self.get_graph(request['path'], request.get('name'))
+        if operation in ('load', 'stats'):
+            return graph.stats()
+        if operation == 'degrees':
+            degrees, positive, negative = graph.degrees(request['vertices'])
+            return {'degree': degrees, 'positive': positive, 'negative': negative}
+        if operation == 'neighbors':
+            return graph.neighbors(request['vertices'])
+        return graph.subgraph(request['vertices'])
+
+    async def __serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answers the requests of a connection in order. The requests are answered in a worker thread, so loading a
+        graph does not block the other connections.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {'error': f"Invalid request: {error}"}
+                else:
+                    response = await loop.run_in_executor(None, self.handle, request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def __lookup(self, key: Tuple[str, str], modified: float):
+        """
+        Returns a cached graph that is up to date and marks it as the most recently used, or None.
+        """
+        cached = self._cache.get(key)
+        if cached is None or cached[0] != modified:
+            return None
+        self._cache.move_to_end(key)
+        return cached[1]
+
+    def __shrink(self):
+        """
+        Removes the least recently used graphs until the cache fits in its limits.
+        """
+        while len(self._cache) > max(self._max_graphs, 1):
+            self._cache.popitem(last=False)
+        if self._max_bytes is not None:
+            while len(self._cache) > 1 and sum(graph.nbytes() for _, graph in self._cache.values()) > self._max_bytes:
+                self._cache.popitem(last=False)
+
+
+class GraphClient:
+    """
+    GraphClient
+    ===========
+
+    :class:`GraphClient` is a blocking client of :class:`GraphServer`. An error answered by the server is raised as a
+    ``ValueError``.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            with GraphClient(socket_path='/tmp/graphs.sock') as client:
+                stats = client.stats('datasets/epinions/2500soc-sign-epinions.txt')
+                degrees = client.degrees('datasets/epinions/2500soc-sign-epinions.txt', [1, 2, 3])['degree']
+    """
+
+    def __init__(self, socket_path: str = None, host: str = '127.0.0.1', port: int = None, timeout: float = None):
+        """
+        Connects to a server, on a Unix socket if ``socket_path`` is given and on a TCP port otherwise.
+        :param socket_path: Path of the Unix socket
+        :param host: Host of the TCP server
+        :param port: Port of the TCP server
+        :param timeout: Timeout of each request, in seconds. None waits forever
+        """
+        if socket_path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address: Any = socket_path
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (host, port)
+        self._socket.settimeout(timeout)
+        self._socket.connect(address)
+        self._file = self._socket.makefile('rwb')
+
+    def request(self, op: str, **arguments) -> Any:
+        """
+        Sends a request and waits for its response.
+        :param op: Operation, see :class:`GraphServer`
+        :param arguments: Arguments of the operation
+        :return: The result of the operation
+        """
+        self._file.write(json.dumps(dict(arguments, op=op)).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response['result']
+
+    def ping(self) -> str:
+        return self.request('ping')
+
+    def stats(self, path: str, name: str = None) -> Dict[str, Any]:
+        """
+        Returns the statistics of a graph, loading it in the server if needed. See ``CompactGraph.stats``.
+        """
+        return self.request('stats', path=path, name=name)
+
+    def degrees(self, path: str, vertices: List[int], name: str = None) -> Dict[str, List[int]]:
+        """
+        Returns the degrees of some vertices, as a dictionary with the lists ``degree``, ``positive`` and ``negative``.
+        """
+        return self.request('degrees', path=path, name=name, vertices=list(vertices))
+
+    def neighbors(self, path: str, vertices: List[int], name: str = None) -> List[List[Tuple[int, int]]]:
+        """
+        Returns the list of (neighbor, sign) of each of some vertices.
+        """
+        return [[tuple(pair) for pair in neighbors]
+                for neighbors in self.request('neighbors', path=path, name=name, vertices=list(vertices))]
+
+    def subgraph(self, path: str, vertices: List[int], name: str = None) -> Graph:
+        """
+        Returns the subgraph induced by some vertices, with their original ids.
+        """
+        edges = self.request('subgraph', path=path, name=name, vertices=list(vertices))
+        return Graph(name=name or os.path.basename(path), vertices=sorted(set(vertices)),
+                     edges=[tuple(edge) for edge in edges])
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'GraphClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _load_graph(path: str, name: str = None) -> CompactGraph:
+    """
+    Reads a graph from a dataset file, or from a graph archive if ``name`` is given.
+    """
+    if name:
+        from util.src.graph_archive import GraphArchiveReader
+
+        with GraphArchiveReader(path) as archive:
+            num_vertices, u, v, weights = archive.read_arrays(name)
+        return CompactGraph(name, num_vertices, u, v, weights)
+    num_vertices, u, v, weights = read_edge_arrays(path)
+    return CompactGraph(os.path.splitext(os.path.basename(path))[0], num_vertices, u, v, weights)
+
+
+def main(arguments: List[str]) -> int:
+    if len(arguments) != 1:
+        print("usage: python -m util.src.graph_server <unix socket path | host:port>", file=sys.stderr)
+        return 2
+    address = arguments[0]
+    host, separator, port = address.rpartition(':')
+    if separator and port.isdigit():
+        GraphServer().run(host=host or '127.0.0.1', port=int(port))
+    else:
+        GraphServer().run(socket_path=address)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
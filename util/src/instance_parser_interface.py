@@ -1,12 +1,23 @@
 import os
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from util.src.graph import Graph
+from util.src.instrumentation import instrumented
+from util.src.properties_store import PropertiesStore
 
 
 class InstanceParserInterface(ABC):
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Instruments the ``parse`` and ``parse_content`` methods of the parsers, see :mod:`util.src.instrumentation`.
+        """
+        super().__init_subclass__(**kwargs)
+        for method_name in ("parse", "parse_content"):
+            if method_name in cls.__dict__:
+                setattr(cls, method_name, instrumented(method_name)(cls.__dict__[method_name]))
+
     @abstractmethod
     def parse(self, path: str) -> 'Graph':
         """
@@ -41,36 +52,50 @@ class InstanceParserInterface(ABC):
                 graphs.append((file_name, file_content))
         return graphs
 
-    def export_graph_properties(self, path: str, file_name: str, graph: Graph):
+    def export_graph_properties(self, path: str, file_name: str, graph: Graph, parameters: Dict[str, Any] = None):
         l=[graph]
-        self.export_properties(path,file_name,l)
+        self.export_properties(path,file_name,l,parameters)
 
-    def export_properties(self, path: str, file_name: str, graphs: List[Graph]):
+    @instrumented("export_properties")
+    def export_properties(self, path: str, file_name: str, graphs: List[Graph], parameters: Dict[str, Any] = None):
         """
         Exports the properties of the graphs to a file.
         The format of the properties is as follows:
-        Header --> Graph name  vertices   edges   density degree average_degree  average_pos_degree average_neg_degree average_weight complete
-        Row 1  --> <graph_name>  <num_vertices>  <num_edges> <density>   <degree>    <average_degree>    <average_pos_degree>   <average_neg_degree>   <average_weight>    <complete>
-        Row 2  --> <graph_name>  <num_vertices>  <num_edges> <density>   <degree>    <average_degree>    <average_pos_degree>   <average_neg_degree>   <average_weight>    <complete>
+        Header --> Graph name  vertices   edges   density degree average_degree  average_pos_degree average_neg_degree average_weight complete max_core
+        Row 1  --> <graph_name>  <num_vertices>  <num_edges> <density>   <degree>    <average_degree>    <average_pos_degree>   <average_neg_degree>   <average_weight>    <complete>    <max_core>
+        Row 2  --> <graph_name>  <num_vertices>  <num_edges> <density>   <degree>    <average_degree>    <average_pos_degree>   <average_neg_degree>   <average_weight>    <complete>    <max_core>
+        The file is written through a :class:`PropertiesStore`, so several processes can export to the same file at the
+        same time, and a NumPy ``.npz`` file with the same columns is written next to it.
         :param path: Path to the file where the properties should be exported to
-        :param file_name: Name of the file where the properties should be exported to. If the file exists,
-        it will contain the properties in addition to the existing content. If the file does not exist, it will be created and will also add the header.
+        :param file_name: Name of the file where the properties should be exported to. If the file exists, the rows of
+        graphs that are already in it are replaced and the others are added. If the file does not exist, it will be
+        created and will also add the header.
         :param graphs: List of graphs whose properties should be exported
+        :param parameters: Parameters of the graphs, e.g. ``{'sampler': 'snowball', 'seed': 42}`` for samples. They
+        are written as columns after the graph name and, together with it, identify a row, so samples with the same
+        name but taken with other parameters do not replace each other. The same parameter names should be used for
+        every export to the same file.
+        """
+        parameters = parameters if parameters else {}
+        rows = [{'Graph name': graph.get_name(), **parameters, **self.get_graph_properties(graph)} for graph in graphs]
+        PropertiesStore(os.path.join(path, file_name), key_columns=('Graph name', *parameters)).upsert(rows)
+
+    def get_graph_properties(self, graph: Graph) -> Dict[str, Any]:
+        """
+        Computes the properties of a graph that are exported by ``export_properties``.
+        :param graph: The graph
+        :return: Dictionary from the name of each property (the column of the properties file) to its value
         """
-        with open(os.path.join(path, file_name), 'a') as file:
-            if os.stat(os.path.join(path, file_name)).st_size == 0:
-                file.write(
-                    'Graph name\tvertices\tedges\tdensity\tdegree\taverage_degree\taverage_pos_degree\taverage_neg_degree\taverage_weight\tcomplete\n')
-            for graph in graphs:
-                name = graph.get_name()
-                num_vertices = len(graph.get_vertices())
-                num_edges = len(graph.get_edges())
-                density = graph.get_density()
-                degree = graph.get_degree()
-                average_degree = graph.get_average_degree()
-                average_pos_degree = graph.get_average_positive_degree()
-                average_neg_degree = graph.get_average_negative_degree()
-                average_weight = graph.get_average_weight()
-                complete = graph.is_complete()
-                file.write(
-                    f'{name}\t{num_vertices}\t{num_edges}\t{density}\t{degree}\t{average_degree}\t{average_pos_degree}\t{average_neg_degree}\t{average_weight}\t{complete}\n')
+        return {
+            'Graph name': graph.get_name(),
+            'vertices': len(graph.get_vertices()),
+            'edges': len(graph.get_edges()),
+            'density': graph.get_density(),
+            'degree': graph.get_degree(),
+            'average_degree': graph.get_average_degree(),
+            'average_pos_degree': graph.get_average_positive_degree(),
+            'average_neg_degree': graph.get_average_negative_degree(),
+            'average_weight': graph.get_average_weight(),
+            'complete': graph.is_complete(),
+            'max_core': graph.get_max_core_number(),
+        }
@@ -0,0 +1,353 @@
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class Instrumentation:
+    """
+    Instrumentation
+    ===============
+
+    :class:`Instrumentation` collects timers and counters of the stages of an export run (parsing, anonymizing,
+    sampling, saving, exporting properties) and writes them to a JSON report. It is disabled by default, and then an
+    instrumented call only costs one attribute check.
+
+    The module level ``instrumentation`` object is the one used by :class:`Graph`, :class:`GraphSampler` and
+    :class:`InstanceParserInterface`. It is enabled by calling ``enable()``, or with the
+    ``SIGNED_GRAPHS_INSTRUMENTATION`` environment variable: ``1`` enables it, and a comma separated list of the options
+    ``profile`` and ``memory`` enables it with those options, e.g. ``SIGNED_GRAPHS_INSTRUMENTATION=profile,memory``.
+
+    For every stage, the report contains the number of calls, the total and maximum time, the number of edges of the
+    graphs that went through the stage and the resulting edges per second, and the peak resident set size of the
+    process during a call of the stage (``peak_rss_kb``). On Linux the peak of the process is reset at the start of
+    each call (by writing ``5`` to ``/proc/self/clear_refs``) and read at the end (``VmHWM``), so memory allocated and
+    freed inside the stage is counted. Where that is not possible, the report contains instead the resident set size
+    when the last call finished (``rss_kb``) and the largest growth of the resident set size between the start and the
+    end of a call (``max_rss_growth_kb``). The peak resident set size of the whole process is reported for the run. With
+    ``trace_memory=True`` (option ``memory``) the report also contains the peak memory allocated by Python during the
+    stage (tracemalloc), and with ``profile=True`` (option ``profile``) the whole run is profiled with cProfile and the
+    profile is written next to the report.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            from util.src.instrumentation import instrumentation
+
+            instrumentation.enable(trace_memory=True)
+            graphs = parser.parse(path_origin)
+            with instrumentation.stage("my_stage"):
+                ...
+            instrumentation.write_report('../dataset/instrumentation.json')
+    """
+
+    # options of the SIGNED_GRAPHS_INSTRUMENTATION environment variable, and the arguments of enable they set
+    _ENVIRONMENT_OPTIONS = {"1": {}, "profile": {"profile": True}, "memory": {"trace_memory": True}}
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._profiler: cProfile.Profile = None
+        # whether the profiler is collecting, it is kept after disable so the profile can still be written
+        self._profiling: bool = False
+        self._trace_memory: bool = False
+        # running peak of traced memory of the active stages, innermost last
+        self._traced_peaks: List[int] = []
+        # running peak resident set size of the active stages, innermost last, and the peak of the process before the
+        # last reset of its high water mark
+        self._rss_peaks: List[int] = []
+        self._reset_rss_peak: int = 0
+        # whether the high water mark of the process can be reset, it is checked on the first stage
+        self._can_reset_rss_peak: bool = True
+        self._start_time: float = time.perf_counter()
+        options = os.environ.get("SIGNED_GRAPHS_INSTRUMENTATION", "")
+        if options not in ("", "0"):
+            arguments = {}
+            for option in options.split(","):
+                if option.strip() not in self._ENVIRONMENT_OPTIONS:
+                    raise ValueError(f"Unknown instrumentation option {option} in SIGNED_GRAPHS_INSTRUMENTATION, use "
+                                     f"{', '.join(self._ENVIRONMENT_OPTIONS)}")
+                arguments.update(self._ENVIRONMENT_OPTIONS[option.strip()])
+            self.enable(**arguments)
+
+    def enable(self, profile: bool = False, trace_memory: bool = False):
+        """
+        Enables the instrumentation.
+        :param profile: If True, profile the run with cProfile until ``disable`` is called. After a ``disable``, the
+        profile collected before is continued.
+        :param trace_memory: If True, trace the memory allocated in each stage with tracemalloc. This makes Python
+        allocations noticeably slower.
+        """
+        self.enabled = True
+        if profile and not self._profiling:
+            if self._profiler is None:
+                self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            self._profiling = True
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._trace_memory = True
+
+    def disable(self):
+        """
+        Disables the instrumentation and stops the profiler and the memory tracing. The collected data is kept.
+        """
+        self.enabled = False
+        if self._profiling:
+            self._profiler.disable()
+            self._profiling = False
+        if self._trace_memory:
+            tracemalloc.stop()
+            self._trace_memory = False
+
+    def reset(self):
+        """
+        Discards the collected data.
+        """
+        self._stages = {}
+        self._counters = {}
+        self._traced_peaks = []
+        self._rss_peaks = []
+        self._start_time = time.perf_counter()
+        if self._profiler is not None:
+            if self._profiling:
+                self._profiler.disable()
+            self._profiler = None
+            if self._profiling:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increases a counter of the report.
+        :param name: Name of the counter
+        :param value: Amount to add
+        """
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name: str, edges: int = 0):
+        """
+        Context manager that times a block of code as a stage of the report.
+        :param name: Name of the stage. The calls of the same stage are aggregated.
+        :param edges: Number of edges processed by the block, used for the throughput
+        """
+        if not self.enabled:
+            yield
+            return
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if self._traced_peaks:
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._traced_peaks.append(0)
+        peak_tracking = self.__reset_rss_peak()
+        if peak_tracking:
+            self._rss_peaks.append(0)
+        start_rss = _current_rss_kb()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            traced_peak = None
+            if tracing:
+                traced_peak = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._traced_peaks:
+                    self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+            rss_peak = None
+            if peak_tracking:
+                rss_peak = max(self._rss_peaks.pop(), _high_water_rss_kb() or 0)
+                if self._rss_peaks:
+                    self._rss_peaks[-1] = max(self._rss_peaks[-1], rss_peak)
+            self.__record(name, elapsed, edges, start_rss, _current_rss_kb(), traced_peak, rss_peak)
+
+    def add_edges(self, name: str, edges: int):
+        """
+        Adds processed edges to a stage, for stages whose number of edges is only known once they finish.
+        :param name: Name of the stage
+        :param edges: Number of edges
+        """
+        if self.enabled and name in self._stages:
+            self._stages[name]["edges"] += edges
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns the collected data.
+        :return: Dictionary with the wall time since the instrumentation was created or reset, the peak resident set
+        size, the stages and the counters
+        """
+        stages = {}
+        for name, stage in self._stages.items():
+            stages[name] = dict(stage)
+            stages[name]["edges_per_second"] = stage["edges"] / stage["seconds"] if stage["seconds"] > 0 else None
+        return {
+            "wall_seconds": time.perf_counter() - self._start_time,
+            "peak_rss_kb": self.__process_peak_rss_kb(),
+            "stages": stages,
+            "counters": dict(self._counters),
+        }
+
+    def write_report(self, path: str):
+        """
+        Writes the report to a JSON file. If the run is being profiled, the profile is written to the same path with
+        the ``.prof`` extension, and can be read with ``pstats`` or ``snakeviz``.
+        :param path: Path of the JSON file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        if self._profiler is not None:
+            if self._profiling:
+                self._profiler.disable()
+            profile_path = os.path.splitext(path)[0] + ".prof"
+            self._profiler.dump_stats(profile_path)
+            report["profile"] = profile_path
+            if self._profiling:
+                self._profiler.enable()
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    def __reset_rss_peak(self) -> bool:
+        """
+        Resets the high water mark of the resident set size of the process, keeping the peak reached so far in the
+        running peaks of the active stages and of the process.
+        :return: True if the high water mark was reset
+        """
+        if not self._can_reset_rss_peak:
+            return False
+        high_water = _high_water_rss_kb()
+        try:
+            with open("/proc/self/clear_refs", "w") as clear_refs:
+                clear_refs.write("5")
+        except OSError:
+            high_water = None
+        if high_water is None:
+            self._can_reset_rss_peak = False
+            return False
+        self._reset_rss_peak = max(self._reset_rss_peak, high_water)
+        if self._rss_peaks:
+            self._rss_peaks[-1] = max(self._rss_peaks[-1], high_water)
+        return True
+
+    def __process_peak_rss_kb(self) -> int:
+        """
+        Returns the peak resident set size of the process, including the peaks before the resets of the high water mark.
+        """
+        peak = _peak_rss_kb()
+        if self._reset_rss_peak:
+            peak = max(peak or 0, self._reset_rss_peak, _high_water_rss_kb() or 0)
+        return peak
+
+    def __record(self, name: str, elapsed: float, edges: int, start_rss: int, end_rss: int, traced_peak: int = None,
+                 rss_peak: int = None):
+        """
+        Adds a finished call to the statistics of a stage.
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "edges": 0}
+        stage["calls"] += 1
+        stage["seconds"] += elapsed
+        stage["max_seconds"] = max(stage["max_seconds"], elapsed)
+        stage["edges"] += edges
+        if rss_peak is not None:
+            stage["peak_rss_kb"] = max(stage.get("peak_rss_kb", 0), rss_peak)
+        else:
+            stage["rss_kb"] = end_rss
+            if start_rss is not None and end_rss is not None:
+                stage["max_rss_growth_kb"] = max(stage.get("max_rss_growth_kb") or 0, end_rss - start_rss)
+        if traced_peak is not None:
+            stage["peak_traced_bytes"] = max(stage.get("peak_traced_bytes", 0), traced_peak)
+
+
+instrumentation = Instrumentation()
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Decorator that records every call of a function as a stage of ``instrumentation``.
+    The number of edges of the stage is taken from the graphs returned by the function or, if it does not return any,
+    from the graphs among its arguments (including ``self``).
+    :param name: Name of the stage
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            with instrumentation.stage(name):
+                result = function(*args, **kwargs)
+            edges = _count_edges(result)
+            if edges == 0:
+                edges = sum(_count_edges(argument) for argument in list(args) + list(kwargs.values()))
+            instrumentation.add_edges(name, edges)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _count_edges(value: Any) -> int:
+    """
+    Counts the edges of a graph, or of the graphs in a list or tuple.
+    """
+    if hasattr(value, "get_edges"):
+        return len(value.get_edges())
+    if isinstance(value, (list, tuple)):
+        return sum(len(item.get_edges()) for item in value if hasattr(item, "get_edges"))
+    return 0
+
+
+def _current_rss_kb() -> int:
+    """
+    Returns the current resident set size of the process in kilobytes, or None if it is not available (it is read from
+    ``/proc``, so only on Linux).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _high_water_rss_kb() -> int:
+    """
+    Returns the high water mark of the resident set size of the process in kilobytes, or None if it is not available
+    (it is read from ``/proc``, so only on Linux).
+    """
+    try:
+        with open("/proc/self/status", "rb") as status:
+            for line in status:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
+def _peak_rss_kb() -> int:
+    """
+    Returns the peak resident set size of the process (in kilobytes on Linux, in bytes on macOS), or None if it is not
+    available.
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -0,0 +1,213 @@
+import csv
+import glob
+import json
+import os
+import socket
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, where the store is not safe for concurrent merges
+    fcntl = None
+
+
+class PropertiesStore:
+    """
+    PropertiesStore
+    ===============
+
+    :class:`PropertiesStore` keeps a table of graph properties (one row per graph) in a delimited text file, and can be
+    fed from many worker processes at the same time.
+
+    Each worker calls ``add`` with its rows, which are appended to a shard file of its own, so workers never write to
+    the same file. ``merge`` folds the shards into the table under a file lock: rows whose key columns match an existing
+    row replace it (so reruns do not duplicate rows), new columns are appended to the header, and the table is
+    rewritten atomically. The merged table is also written in columnar form to a NumPy ``.npz`` file next to it, with
+    one array per column, which loads much faster than the text file for thousands of rows.
+
+    The table is tab separated unless the file name ends with ``.csv``.
+
+    Example Usage
+    -------------
+        .. code-block:: python
+
+            store = PropertiesStore('../dataset/properties.txt')
+            # in every worker
+            store.add([{'Graph name': 'graph1', 'vertices': 100, 'edges': 450}])
+            # once all the workers are done (or after every add, it is safe to call it concurrently)
+            store.merge()
+            columns = store.load_columns()
+    """
+
+    def __init__(self, path: str, key_columns: Sequence[str] = ('Graph name',), columnar: bool = True):
+        """
+        :param path: Path of the table
+        :param key_columns: Columns that identify a row. A new row replaces the existing row with the same values in
+        these columns.
+        :param columnar: If True, ``merge`` also writes the table to a ``.npz`` file with the same base name.
+        """
+        self._path: str = path
+        self._key_columns: Tuple[str, ...] = tuple(key_columns)
+        self._columnar: bool = columnar
+        self._delimiter: str = ',' if path.endswith('.csv') else '\t'
+        self._shard_directory: str = path + '.shards'
+
+    def add(self, rows: List[Dict[str, Any]]):
+        """
+        Appends rows to the shard of the current process. The rows are not visible in the table until ``merge`` is
+        called.
+        :param rows: Rows to add, as dictionaries from column name to value. Every row must contain the key columns.
+        """
+        for row in rows:
+            missing = [column for column in self._key_columns if column not in row]
+            if missing:
+                raise ValueError(f"Row {row} does not contain the key columns {missing}")
+        os.makedirs(self._shard_directory, exist_ok=True)
+        shard_path = os.path.join(self._shard_directory, f"{socket.gethostname()}-{os.getpid()}.jsonl")
+        data = ''.join(json.dumps({column: str(value) for column, value in row.items()}) + '\n' for row in rows)
+        while True:
+            with open(shard_path, 'a') as shard:
+                with _locked(shard):
+                    # a merge may have renamed the shard between the open and the lock, then the rows would be
+                    # written to a file that has already been merged, so the shard is opened again
+                    try:
+                        renamed = os.fstat(shard.fileno()).st_ino != os.stat(shard_path).st_ino
+                    except FileNotFoundError:
+                        renamed = True
+                    if not renamed:
+                        shard.write(data)
+                        return
+
+    def merge(self) -> List[Dict[str, str]]:
+        """
+        Folds the rows of all the shards into the table and removes the shards.
+        :return: The rows of the merged table
+        """
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self._path + '.lock', 'a') as lock:
+            with _locked(lock):
+                columns, rows = self.__read_table()
+                index = {self.__key(row): position for position, row in enumerate(rows)}
+                for shard_path in glob.glob(os.path.join(self._shard_directory, '*.jsonl')):
+                    # new rows of the worker go to a new shard while this one is merged
+                    os.replace(shard_path, f"{shard_path[:-len('.jsonl')]}.{uuid.uuid4().hex}.merging")
+                # shards left by an interrupted merge are merged too
+                for merging_path in sorted(glob.glob(os.path.join(self._shard_directory, '*.merging'))):
+                    with open(merging_path, 'r') as shard:
+                        # wait for a write that started before the rename
+                        with _locked(shard):
+                            shard_rows = [json.loads(line) for line in shard if line.strip()]
+                    for row in shard_rows:
+                        for column in row:
+                            if column not in columns:
+                                columns.append(column)
+                        key = self.__key(row)
+                        if key in index:
+                            rows[index[key]] = row
+                        else:
+                            index[key] = len(rows)
+                            rows.append(row)
+                    os.remove(merging_path)
+                self.__write_table(columns, rows)
+                if self._columnar:
+                    self.__write_columns(columns, rows)
+        return rows
+
+    def upsert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Adds rows and merges them into the table.
+        :param rows: Rows to add, see ``add``
+        :return: The rows of the merged table
+        """
+        self.add(rows)
+        return self.merge()
+
+    def read(self) -> List[Dict[str, str]]:
+        """
+        Reads the rows of the table. Missing values are empty strings.
+        """
+        columns, rows = self.__read_table()
+        return [{column: row.get(column, '') for column in columns} for row in rows]
+
+    def load_columns(self) -> Dict[str, Any]:
+        """
+        Loads the columnar form of the table written by ``merge``.
+        :return: Dictionary from column name to NumPy array. Numeric columns are float arrays (NaN for missing
+        values), boolean columns are bool arrays and the others are string arrays.
+        """
+        import numpy as np
+
+        with np.load(self.__columnar_path()) as data:
+            return {column: data[column] for column in data.files}
+
+    def __key(self, row: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(row.get(column, '') for column in self._key_columns)
+
+    def __columnar_path(self) -> str:
+        return os.path.splitext(self._path)[0] + '.npz'
+
+    def __read_table(self) -> Tuple[List[str], List[Dict[str, str]]]:
+        """
+        Reads the header and the rows of the table, or returns an empty table if the file does not exist.
+        """
+        if not os.path.exists(self._path):
+            return [], []
+        with open(self._path, 'r', newline='') as file:
+            lines = [line for line in csv.reader(file, delimiter=self._delimiter) if line]
+        if not lines:
+            return [], []
+        columns = lines[0]
+        rows = [dict(zip(columns, line)) for line in lines[1:]]
+        return columns, rows
+
+    def __write_table(self, columns: List[str], rows: List[Dict[str, str]]):
+        """
+        Writes the table to a temporary file and moves it over the table, so readers never see a partial table.
+        """
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(self._path) or '.', suffix='.tmp')
+        with os.fdopen(descriptor, 'w', newline='') as file:
+            writer = csv.writer(file, delimiter=self._delimiter, lineterminator='\n')
+            writer.writerow(columns)
+            writer.writerows([row.get(column, '') for column in columns] for row in rows)
+        os.replace(temporary_path, self._path)
+
+    def __write_columns(self, columns: List[str], rows: List[Dict[str, str]]):
+        """
+        Writes the table to the ``.npz`` file, one array per column.
+        """
+        import numpy as np
+
+        arrays = {}
+        for column in columns:
+            values = [row.get(column, '') for row in rows]
+            if all(value in ('True', 'False') for value in values):
+                arrays[column] = np.array([value == 'True' for value in values], dtype=bool)
+                continue
+            try:
+                arrays[column] = np.array([float(value) if value != '' else np.nan for value in values])
+            except ValueError:
+                arrays[column] = np.array(values, dtype=str)
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(self._path) or '.', suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(temporary_path, self.__columnar_path())
+
+
+@contextmanager
+def _locked(file):
+    """
+    Holds an exclusive lock on an open file, if file locks are available.
+    """
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
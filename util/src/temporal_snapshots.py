@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple, Union
+
+from util.src.graph import Graph
+
+
+def temporal_snapshots(name: str, ratings: Iterable[Tuple[int, int, int, int]], cut_points: Union[int, List[int]],
+                       window: int = None) -> Iterator[Tuple[int, Graph]]:
+    """
+    Yields a snapshot of a temporal signed graph at each cut point.
+    The ratings are sorted by timestamp once, and each snapshot is obtained from the previous one by adding the ratings
+    up to the new cut point and, with a sliding window, removing the ones that left the window, so all the snapshots
+    together cost about one pass over the ratings.
+    The ratings between a pair of vertices, in any direction, are merged into a single undirected edge, whose sign is
+    the sign of the most recent rating in the snapshot. Ratings of a vertex to itself are skipped.
+    The same graph object is updated and yielded at every cut point, so it must be saved or copied before asking for the
+    next snapshot. Its vertices go from 1 to the largest vertex of the ratings.
+    :param name: Name of the snapshots
+    :param ratings: Tuples with the timestamp, the vertex that rates, the rated vertex and the sign (1 or -1). The
+    vertices are positive integers.
+    :param cut_points: Increasing timestamps of the snapshots, or the number of snapshots to take at evenly spaced
+    timestamps between the first and the last rating
+    :param window: If None, each snapshot contains all the ratings up to its cut point. Otherwise, it only contains the
+    ratings with timestamp in ``(cut_point - window, cut_point]``
+    :return: Iterator of tuples with the cut point and the snapshot
+    :raises ValueError: If there are no ratings
+    """
+    ratings = sorted((timestamp, u, v, sign) for timestamp, u, v, sign in ratings if u != v)
+    if not ratings:
+        raise ValueError(f"There are no ratings between different vertices in {name}")
+    if isinstance(cut_points, int):
+        first, last = ratings[0][0], ratings[-1][0]
+        cut_points = [first + (last - first) * (i + 1) // cut_points for i in range(cut_points)]
+
+    num_vertices = max(max(u, v) for _, u, v, _ in ratings)
+    graph = Graph(name=name, vertices=list(range(1, num_vertices + 1)), edges=[])
+    # signs of the ratings of each pair of vertices in the current snapshot, oldest first
+    active: Dict[Tuple[int, int], Deque[int]] = {}
+    added = 0
+    expired = 0
+    for cut_point in cut_points:
+        while added < len(ratings) and ratings[added][0] <= cut_point:
+            _, u, v, sign = ratings[added]
+            key = (min(u, v), max(u, v))
+            if key not in active:
+                active[key] = deque()
+                graph.add_edge(u, v, sign)
+            elif active[key][-1] != sign:
+                graph.set_sign(u, v, sign)
+            active[key].append(sign)
+            added += 1
+        if window is not None:
+            while expired < added and ratings[expired][0] <= cut_point - window:
+                _, u, v, _ = ratings[expired]
+                key = (min(u, v), max(u, v))
+                # ratings expire in timestamp order, so the oldest rating of the pair is the one leaving
+                active[key].popleft()
+                if not active[key]:
+                    del active[key]
+                    graph.remove_edge(u, v)
+                expired += 1
+        yield cut_point, graph
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from util.src.dataset_validator import DatasetValidator
+
+
+class TestDatasetValidator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.validator = DatasetValidator()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, file_name, content):
+        path = os.path.join(self.directory.name, file_name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_valid_files(self):
+        self.assertEqual([], self.validator.validate_file(self.write('a.txt', '5 3\n1 2 1\n1 3 1\n2 3 -1\n')))
+        self.assertEqual([], self.validator.validate_file(
+            self.write('b.txt', '# This is an adaptation\nvertices: 3 edges: 2\n1 2 1\n3 1 -1\n\n')))
+        self.assertEqual([], self.validator.validate_file(self.write('empty.txt', '3 0\n')))
+
+    def test_problems(self):
+        path = self.write('c.txt', '4 6\n'
+                                   '1 2 1\n'
+                                   '2 5 1\n'
+                                   '3 3 -1\n'
+                                   '2 1 -1\n'
+                                   '1 4 2\n'
+                                   '1 4\n'
+                                   '4 x 1\n')
+        problems = [(problem.line, problem.message) for problem in self.validator.validate_file(path)]
+        self.assertEqual([(1, 'the header says 6 edges but there are 7 edge lines'),
+                          (3, 'vertex id outside [1, 4]'),
+                          (4, 'self-loop'),
+                          (5, 'duplicate edge of line 2'),
+                          (6, 'weight is not -1 or 1'),
+                          (7, 'the line does not have 3 values'),
+                          (8, 'the values are not integers')], problems)
+
+    def test_malformed_header(self):
+        problems = self.validator.validate_file(self.write('d.txt', '1 2 1\n1 3 1\n'))
+        self.assertEqual([(1, "malformed header b'1 2 1'")], [(problem.line, problem.message) for problem in problems])
+
+    def test_validate_tree(self):
+        os.makedirs(os.path.join(self.directory.name, 'family'))
+        self.write('family/e.txt', '3 1\n1 2 1\n')
+        self.write('family/f.txt', '3 2\n1 2 1\n')
+        self.write('family/notes.md', 'not a dataset\n')
+        problems = DatasetValidator().validate_tree(self.directory.name, processes=2)
+        self.assertEqual(1, len(problems))
+        self.assertTrue(problems[0].path.endswith('f.txt'))
+
+    def test_report_limit(self):
+        path = self.write('g.txt', '3 5\n' + '1 1 1\n' * 5)
+        problems = DatasetValidator(max_problems_per_check=2).validate_file(path)
+        self.assertEqual(['5 lines in total with: self-loop', 'self-loop', 'self-loop'],
+                         sorted(problem.message for problem in problems if 'self-loop' in problem.message))
+
+
+if __name__ == '__main__':
+    unittest.main()
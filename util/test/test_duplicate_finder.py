@@ -0,0 +1,37 @@
+import os
+import random
+import tempfile
+import unittest
+
+from util.src.duplicate_finder import DuplicateFinder
+from util.src.graph import Graph
+from util.src.graph_generator import GraphGenerator
+
+
+class TestDuplicateFinder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, 'datasets') + os.sep
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_find_duplicates(self):
+        graph = GraphGenerator(seed=2).random(60, 10, 50, name='original')
+        graph.save_graph_to_file(os.path.join(self.root, 'a') + os.sep)
+        # the same graph with the vertices relabeled and the edges shuffled
+        labels = list(range(1, 61))
+        random.Random(4).shuffle(labels)
+        edges = [(labels[v - 1], labels[u - 1], weight) for u, v, weight in graph.get_edges()]
+        random.Random(5).shuffle(edges)
+        Graph('relabeled', list(range(1, 61)), edges).save_graph_to_file(os.path.join(self.root, 'b') + os.sep)
+        GraphGenerator(seed=3).random(60, 10, 50, name='other').save_graph_to_file(self.root)
+
+        finder = DuplicateFinder(processes=2)
+        self.assertEqual([[os.path.join(self.root, 'a', 'original.txt'), os.path.join(self.root, 'b', 'relabeled.txt')]],
+                         finder.find_duplicates(self.root))
+        self.assertEqual(graph.fingerprint(), finder.fingerprint_file(os.path.join(self.root, 'a', 'original.txt')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from util.src.edge_list_converter import EdgeListConverter, agreement_merge_policy, negative_merge_policy, \
+    positive_merge_policy
+from util.src.graph import Graph
+
+
+class TestEdgeListConverter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'source.txt')
+        self.destination = os.path.join(self.directory.name, 'out', 'destination.txt')
+        with open(self.source, 'w') as file:
+            file.write('# Directed graph\n'
+                       '# FromNodeId\tToNodeId\tSign\n'
+                       '0\t1\t1\n'
+                       '1\t0\t1\n'
+                       '2\t0\t-1\n'
+                       '0\t2\t1\n'
+                       '3\t1\t-1\n'
+                       '1\t4\t1\n'
+                       '4\t4\t1\n'
+                       '1\t3\t-1\n'
+                       '4\t1\t-1\n'
+                       '0\t1\t-1\n'
+                       '0\t1\t1\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_edges(self):
+        graph = Graph()
+        num_vertices, num_edges, edges = graph.read_graph_from_file(self.destination)
+        return num_vertices, num_edges, edges
+
+    def test_agreement_policy(self):
+        # a chunk size of 2 forces several spill files
+        num_vertices, num_edges = EdgeListConverter(chunk_size=2).convert(self.source, self.destination)
+        self.assertEqual((5, 2), (num_vertices, num_edges))
+        self.assertEqual((5, 2, [(1, 2, 1), (2, 4, -1)]), self.read_edges())
+
+    def test_other_policies(self):
+        EdgeListConverter(chunk_size=3, merge_policy=negative_merge_policy).convert(self.source, self.destination)
+        self.assertEqual([(1, 2, 1), (1, 3, -1), (2, 4, -1), (2, 5, -1)], self.read_edges()[2])
+        EdgeListConverter(merge_policy=positive_merge_policy).convert(self.source, self.destination)
+        self.assertEqual([(1, 2, 1), (1, 3, 1), (2, 4, -1), (2, 5, 1)], self.read_edges()[2])
+
+    def test_policies(self):
+        self.assertEqual(1, agreement_merge_policy(1, None))
+        self.assertEqual(-1, agreement_merge_policy(None, -1))
+        self.assertEqual(-1, agreement_merge_policy(-1, -1))
+        self.assertIsNone(agreement_merge_policy(1, -1))
+
+
+if __name__ == '__main__':
+    unittest.main()
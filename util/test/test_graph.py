@@ -1,6 +1,9 @@
 import unittest
+import warnings
 
-from util.src.graph import Graph
+import numpy
+
+from util.src.graph import Graph, parse_dataset_header, read_edge_arrays, split_dataset_file
 
 
 class TestGraph(unittest.TestCase):
@@ -67,6 +70,40 @@ class TestGraph(unittest.TestCase):
         import os
         os.remove('test_graphs_folder/test_graph_save.txt')
 
+    def test_read_graph_with_comments(self):
+        # header and comment of the harwell-boeing and complete datasets
+        with open('test_graphs_folder/test_graph_comments.txt', 'w') as file:
+            file.write('# This is an adaptation of one of the original Harwell-Boeing instances\n'
+                       'vertices: 3 edges: 2\n1 2 1\n2 3 -1\n\n')
+        num_vertices, num_edges, edges = Graph().read_graph_from_file('test_graphs_folder/test_graph_comments.txt')
+        self.assertEqual((3, 2, [(1, 2, 1), (2, 3, -1)]), (num_vertices, num_edges, edges))
+
+        import os
+        os.remove('test_graphs_folder/test_graph_comments.txt')
+
+    def test_read_edge_arrays(self):
+        with open('test_graphs_folder/test_graph_arrays.txt', 'w') as file:
+            file.write('# comment\n\nvertices: 4 edges: 2\n1 2 1\n4 3 -1\n')
+        num_vertices, u, v, weights = read_edge_arrays('test_graphs_folder/test_graph_arrays.txt')
+        self.assertEqual(4, num_vertices)
+        self.assertEqual(([0, 3], [1, 2], [1, -1]), (u.tolist(), v.tolist(), weights.tolist()))
+        with open('test_graphs_folder/test_graph_arrays.txt', 'w') as file:
+            file.write('# only a comment\n')
+        with self.assertRaises(ValueError):
+            read_edge_arrays('test_graphs_folder/test_graph_arrays.txt')
+        with self.assertRaises(ValueError):
+            Graph().read_graph_from_file('test_graphs_folder/test_graph_arrays.txt')
+
+        import os
+        os.remove('test_graphs_folder/test_graph_arrays.txt')
+
+    def test_dataset_header(self):
+        self.assertEqual((2, None, []), split_dataset_file(b'# a\n#b\n'))
+        self.assertEqual((1, b' 5 7', [b'1 2 1']), split_dataset_file(b'# a\n 5 7\n1 2 1\n\n'))
+        self.assertEqual((5, 7), parse_dataset_header(b' 5 7'))
+        self.assertEqual((5, 7), parse_dataset_header(b'vertices: 5 edges: 7\r'))
+        self.assertIsNone(parse_dataset_header(b'1 2 1'))
+
     def test_subgraph(self):
         # Test subgraph
         """
@@ -80,6 +117,218 @@ class TestGraph(unittest.TestCase):
         self.assertEqual([1, 2, 3], subgraph.get_vertices())
         self.assertEqual([(1, 2, 1), (1, 3, 1), (2, 3, -1)], subgraph.get_edges())
 
+    def test_induced_subgraph(self):
+        # Test induced subgraph
+        """
+        1 2 1
+        1 3 1
+        2 3 -1
+        4 5 -1
+        """
+        subgraph = self.graph.induced_subgraph([3, 2, 4])
+        self.assertIsInstance(subgraph, Graph)
+        self.assertEqual([3, 2, 4], subgraph.get_vertices())
+        self.assertEqual([(3, 2, -1)], subgraph.get_edges())
+        self.assertEqual([], subgraph.get_adjacent_vertices(4))
+
+        # self-loops are kept once
+        graph = Graph(vertices=[1, 2, 3], edges=[(2, 2, -1), (1, 2, 1), (2, 2, 1), (3, 3, 1)])
+        subgraph = graph.induced_subgraph([2, 1])
+        self.assertEqual([(2, 2, -1), (2, 1, 1), (2, 2, 1)], subgraph.get_edges())
+        self.assertEqual(3, subgraph.get_degree(2))
+
+    def test_remove_edge(self):
+        """
+        1 2 1
+        1 3 1
+        2 3 -1
+        4 5 -1
+        """
+        self.assertTrue(self.graph.has_edge(2, 1))
+        self.assertEqual(2, self.graph.get_number_of_positives_edges())
+        self.graph.remove_edge(2, 1)
+        self.assertFalse(self.graph.has_edge(1, 2))
+        # the last edge takes the place of the removed one
+        self.assertEqual([(4, 5, -1), (1, 3, 1), (2, 3, -1)], self.graph.get_edges())
+        self.assertEqual([(3, 1)], self.graph.get_adjacent_vertices(1))
+        self.assertEqual([(3, -1)], self.graph.get_adjacent_vertices(2))
+        self.assertEqual(1, self.graph.get_number_of_positives_edges())
+        with self.assertRaises(ValueError):
+            self.graph.remove_edge(1, 2)
+
+        # the indexes are kept up to date by add_edge
+        self.graph.add_edge(2, 4, 1)
+        self.graph.remove_edge(4, 5)
+        self.graph.remove_edge(4, 2)
+        self.assertEqual([(2, 3, -1), (1, 3, 1)], self.graph.get_edges())
+        self.assertEqual([], self.graph.get_adjacent_vertices(4))
+        self.assertEqual(1, self.graph.get_number_of_negatives_edges())
+
+    def test_update_parallel_edges(self):
+        # an edge stored in both directions cannot be identified by its endpoints: it can be looked up, not updated
+        graph = Graph(vertices=[1, 2, 3, 4], edges=[(1, 2, 1), (2, 3, -1), (2, 1, -1), (3, 3, 1), (3, 4, 1)])
+        self.assertTrue(graph.has_edge(1, 2))
+        self.assertIn(graph.get_weight(2, 1), (1, -1))
+        for update in (lambda: graph.remove_edge(1, 2), lambda: graph.set_sign(2, 1, 1), lambda: graph.flip_sign(3, 3)):
+            with self.assertRaises(ValueError):
+                update()
+        self.assertEqual([(1, 1), (3, -1), (1, -1)], graph.get_adjacent_vertices(2))
+
+        # the unique edges are still updated, also next to the parallel edges and the self-loop
+        self.assertTrue(graph.has_edge(3, 2))
+        self.assertEqual(1, graph.get_weight(3, 3))
+        graph.flip_sign(3, 2)
+        graph.remove_edge(3, 4)
+        graph.remove_edge(2, 3)
+        self.assertFalse(graph.has_edge(2, 3))
+        self.assertEqual([(1, 2, 1), (3, 3, 1), (2, 1, -1)], graph.get_edges())
+        self.assertEqual([(1, 1), (1, -1)], graph.get_adjacent_vertices(2))
+        self.assertEqual([(3, 1), (3, 1)], graph.get_adjacent_vertices(3))
+        self.assertEqual(1, graph.get_number_of_negatives_edges())
+
+        # the same happens when the parallel edge is added after the indexes are built
+        self.graph.remove_edge(1, 3)
+        self.graph.add_edge(3, 2, 1)
+        with self.assertRaises(ValueError):
+            self.graph.remove_edge(2, 3)
+        self.assertTrue(self.graph.has_edge(2, 3))
+        self.graph.flip_sign(4, 5)
+        self.graph.remove_edge(1, 2)
+        self.assertEqual([(3, 2, 1), (4, 5, 1), (2, 3, -1)], self.graph.get_edges())
+        self.assertEqual([(3, -1), (3, 1)], sorted(self.graph.get_adjacent_vertices(2)))
+
+    def test_set_sign(self):
+        self.assertEqual(2, self.graph.get_number_of_negatives_edges())
+        self.graph.flip_sign(3, 2)
+        self.assertEqual(1, self.graph.get_weight(2, 3))
+        self.assertEqual((2, 3, 1), self.graph.get_edges()[2])
+        self.assertEqual([(1, 1), (3, 1)], self.graph.get_adjacent_vertices(2))
+        self.assertEqual([(1, 1), (2, 1)], self.graph.get_adjacent_vertices(3))
+        self.assertEqual(1, self.graph.get_number_of_negatives_edges())
+
+        self.graph.set_sign(1, 2, -1)
+        self.assertEqual(-1, self.graph.get_weight(1, 2))
+        self.assertEqual(2, self.graph.get_number_of_positives_edges())
+        with self.assertRaises(ValueError):
+            self.graph.set_sign(1, 2, 0)
+        with self.assertRaises(ValueError):
+            self.graph.flip_sign(1, 4)
+
+    def test_scipy_sparse(self):
+        """
+        1 2 1
+        1 3 1
+        2 3 -1
+        4 5 -1
+        """
+        adjacency = self.graph.to_scipy_sparse().toarray()
+        self.assertEqual([[0, 1, 1, 0, 0],
+                          [1, 0, -1, 0, 0],
+                          [1, -1, 0, 0, 0],
+                          [0, 0, 0, 0, -1],
+                          [0, 0, 0, -1, 0]], adjacency.tolist())
+        laplacian = self.graph.to_scipy_sparse(laplacian=True).toarray()
+        self.assertEqual([2, 2, 2, 1, 1], laplacian.diagonal().tolist())
+        self.assertEqual((numpy.diag([2, 2, 2, 1, 1]) - adjacency).tolist(), laplacian.tolist())
+
+        graph = Graph.from_scipy_sparse(self.graph.to_scipy_sparse(), name="copy")
+        self.assertEqual([1, 2, 3, 4, 5], graph.get_vertices())
+        self.assertCountEqual(self.edges, graph.get_edges())
+        self.assertEqual([(1, 1), (3, -1)], graph.get_adjacent_vertices(2))
+
+        # vertices that are not numbered from 1 to n
+        graph = Graph(vertices=["a", "b", "c"], edges=[("c", "a", -1)])
+        self.assertEqual([[0, 0, -1], [0, 0, 0], [-1, 0, 0]], graph.to_scipy_sparse().toarray().tolist())
+
+        # the arrays are cleared when the graph changes
+        self.graph.add_edge(1, 5, 1)
+        self.assertEqual(1, self.graph.to_scipy_sparse()[4, 0])
+
+    def test_signed_spectrum(self):
+        # the triangle 1 2 3 has one negative edge, so it is not balanced, and the edge 4 5 is
+        spectrum = self.graph.signed_spectrum(k=2)
+        self.assertEqual(2, len(spectrum))
+        self.assertGreater(spectrum[0], 0.1)
+        # the edge 4 5 is a tree, it is only counted when the trivial components are included
+        spectrum = self.graph.signed_spectrum(k=2, include_trivial=True)
+        self.assertAlmostEqual(0, spectrum[0])
+        self.assertGreater(spectrum[1], 0.1)
+
+        self.graph.flip_sign(2, 3)
+        self.assertAlmostEqual(0, self.graph.signed_spectrum()[0])
+        self.graph.remove_edge(4, 5)
+        first, second, frustrated = self.graph.spectral_bipartition()
+        self.assertEqual(0, frustrated)
+        self.assertCountEqual([1, 2, 3, 4, 5], first + second)
+        self.assertEqual([0, 3, 3], self.graph.signed_spectrum(k=3).round(6).tolist())
+        self.assertEqual([0, 0, 0], self.graph.signed_spectrum(k=3, include_trivial=True).round(6).tolist())
+
+    def test_signed_spectrum_trivial_components(self):
+        # a forest is balanced
+        forest = Graph(vertices=[1, 2, 3, 4, 5], edges=[(1, 2, -1), (2, 3, 1), (4, 5, -1)])
+        self.assertEqual([0, 0], forest.signed_spectrum(k=2).tolist())
+        # isolated vertices do not hide a frustrated component
+        rng = numpy.random.default_rng(1)
+        edges = [(u, v, 1 if rng.random() < 0.5 else -1)
+                 for u in range(1, 301) for v in range(u + 1, 301) if rng.random() < 0.05]
+        graph = Graph(vertices=list(range(1, 311)), edges=edges)
+        for method in ("lobpcg", "lanczos"):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self.assertGreater(graph.signed_spectrum(method=method)[0], 0.1)
+        self.assertEqual(0, graph.signed_spectrum(include_trivial=True)[0])
+
+        # a graph without edges only has isolated vertices
+        graph = Graph(vertices=[1, 2, 3])
+        self.assertEqual(([1, 2, 3], [], 0), graph.spectral_bipartition())
+        self.assertEqual([0, 0], graph.signed_spectrum(k=2).tolist())
+        self.assertEqual([0, 0], graph.signed_spectrum(k=2, include_trivial=True).tolist())
+        # trees are split by the signs of their edges
+        graph = Graph(vertices=[1, 2, 3, 4], edges=[(1, 2, -1), (2, 3, 1)])
+        self.assertEqual(([1, 4], [2, 3], 0), graph.spectral_bipartition())
+        self.assertEqual([0, 0, 1, 3], graph.signed_spectrum(k=4, include_trivial=True).round(6).tolist())
+
+    def test_signed_spectrum_disjoint_edges(self):
+        # a balanced graph plus disjoint edges, whose eigenvalue 0 must not decide the split of the rest
+        rng = numpy.random.default_rng(0)
+        group = rng.random(400) < 0.5
+        edges = [(u, v, 1 if group[u - 1] == group[v - 1] else -1)
+                 for u in range(1, 401) for v in range(u + 1, 401) if rng.random() < 0.05]
+        graph = Graph(vertices=list(range(1, 405)), edges=edges + [(401, 402, 1), (403, 404, -1)])
+        dense = numpy.linalg.eigvalsh(graph.to_scipy_sparse(laplacian=True).toarray())[:4]
+        for method in ("lobpcg", "lanczos"):
+            first, second, frustrated = graph.spectral_bipartition(method=method)
+            self.assertEqual(0, frustrated)
+            self.assertEqual(404, len(first) + len(second))
+            numpy.testing.assert_allclose(dense, graph.signed_spectrum(k=4, method=method, include_trivial=True),
+                                          atol=1e-6)
+            self.assertAlmostEqual(0, graph.signed_spectrum(method=method)[0], places=6)
+
+    def test_signed_spectrum_iterative(self):
+        # a balanced graph: positive edges inside the two groups, negative edges between them
+        rng = numpy.random.default_rng(0)
+        group = rng.random(400) < 0.5
+        edges = [(u, v, 1 if group[u - 1] == group[v - 1] else -1)
+                 for u in range(1, 401) for v in range(u + 1, 401) if rng.random() < 0.05]
+        graph = Graph(vertices=list(range(1, 401)), edges=edges)
+        for method in ("lobpcg", "lanczos"):
+            self.assertAlmostEqual(0, graph.signed_spectrum(k=2, method=method)[0], places=4)
+            first, second, frustrated = graph.spectral_bipartition(method=method)
+            self.assertEqual(0, frustrated)
+            self.assertIn(sorted(first), [[v for v in range(1, 401) if group[v - 1]],
+                                          [v for v in range(1, 401) if not group[v - 1]]])
+
+        graph.flip_sign(*edges[0][:2])
+        self.assertGreater(graph.signed_spectrum()[0], 1e-4)
+        with self.assertRaises(ValueError):
+            graph.signed_spectrum(method="dense")
+
+    def test_to_networkx(self):
+        G = self.graph.to_networkx()
+        self.assertEqual(5, G.number_of_nodes())
+        self.assertEqual(4, G.number_of_edges())
+        self.assertEqual(-1, G[3][2]['weight'])
+
     def test_generate_subgraph(self):
         # Test subgraph
         """
@@ -101,6 +350,81 @@ class TestGraph(unittest.TestCase):
         self.assertTrue(os.path.exists('test_graphs_folder/test_graph_print.txt.png'))
         os.remove('test_graphs_folder/test_graph_print.txt.png')
 
+    def test_print_large_graph(self):
+        import os
+        from util.src.graph_generator import GraphGenerator
+        graph = GraphGenerator(seed=5).random(300, 5, 60, name='large_graph')
+        # the layout is computed once and reused while the edges do not change
+        layout = graph.compute_layout()
+        self.assertEqual((300, 2), layout.shape)
+        self.assertIs(layout, graph.compute_layout())
+        self.assertIsNot(layout, graph.compute_layout('spectral'))
+        with self.assertRaises(ValueError):
+            graph.compute_layout('circular')
+        graph.print_graph('test_graphs_folder/', max_edges=500)
+        self.assertTrue(os.path.exists('test_graphs_folder/large_graph.png'))
+        os.remove('test_graphs_folder/large_graph.png')
+
+    def test_fingerprint(self):
+        """
+        Using the following graph:
+        1 2 1
+        1 3 1
+        2 3 -1
+        4 5 -1
+        """
+        fingerprint = self.graph.fingerprint()
+        self.assertEqual(32, len(fingerprint))
+        # the names and order of the vertices and edges do not matter
+        relabeled = Graph(name='other', vertices=['e', 'd', 'c', 'b', 'a'],
+                          edges=[('b', 'a', -1), ('c', 'e', -1), ('e', 'd', 1), ('c', 'd', 1)])
+        self.assertEqual(fingerprint, relabeled.fingerprint())
+        # the signs do
+        flipped = Graph(vertices=self.vertices, edges=[(1, 2, 1), (1, 3, 1), (2, 3, 1), (4, 5, -1)])
+        self.assertNotEqual(fingerprint, flipped.fingerprint())
+        # a path and a triangle next to a shorter path have the same degrees, only the refinement tells them apart
+        path = Graph(vertices=list(range(1, 7)), edges=[(i, i + 1, 1) for i in range(1, 6)])
+        triangle = Graph(vertices=list(range(1, 7)), edges=[(1, 2, 1), (2, 3, 1), (3, 1, 1), (4, 5, 1), (5, 6, 1)])
+        self.assertEqual(path.fingerprint(wl_rounds=0), triangle.fingerprint(wl_rounds=0))
+        self.assertNotEqual(path.fingerprint(), triangle.fingerprint())
+
+    def test_core_numbers(self):
+        """
+        Using the following graph:
+        1 2 1
+        1 3 1
+        2 3 -1
+        4 5 -1
+        """
+        self.assertEqual({1: 2, 2: 2, 3: 2, 4: 1, 5: 1}, self.graph.core_numbers())
+        self.assertEqual({1: 1, 2: 1, 3: 1, 4: 0, 5: 0}, self.graph.core_numbers(sign=1))
+        self.assertEqual({1: 0, 2: 1, 3: 1, 4: 1, 5: 1}, self.graph.core_numbers(sign=-1))
+        self.assertEqual(2, self.graph.get_max_core_number())
+        with self.assertRaises(ValueError):
+            self.graph.core_numbers(sign=2)
+
+        core = self.graph.k_core(2)
+        self.assertEqual([1, 2, 3], core.get_vertices())
+        self.assertEqual([(1, 2, 1), (1, 3, 1), (2, 3, -1)], core.get_edges())
+        # the positive 1-core keeps the negative edges between its vertices
+        self.assertEqual([(1, 2, 1), (1, 3, 1), (2, 3, -1)], self.graph.k_core(1, sign=1).get_edges())
+        self.assertEqual([], self.graph.k_core(3).get_vertices())
+
+    def test_core_numbers_random(self):
+        import networkx as nx
+        from util.src.graph_generator import GraphGenerator
+        graph = GraphGenerator(seed=11).random(300, 4, 50)
+        self.assertEqual(nx.core_number(graph.to_networkx()), graph.core_numbers())
+        positive = Graph(vertices=graph.get_vertices(), edges=[edge for edge in graph.get_edges() if edge[2] > 0])
+        self.assertEqual(positive.core_numbers(), graph.core_numbers(sign=1))
+
+        # each vertex has at most max core number edges to the vertices after it
+        ordering = graph.degeneracy_ordering()
+        position = {vertex: i for i, vertex in enumerate(ordering)}
+        later_neighbors = [sum(1 for neighbor, _ in graph.get_adjacent_vertices(vertex)
+                               if position[neighbor] > position[vertex]) for vertex in ordering]
+        self.assertEqual(graph.get_max_core_number(), max(later_neighbors))
+
 
     def test_degree(self):
         """
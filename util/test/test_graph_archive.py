@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from util.src.graph import Graph
+from util.src.graph_archive import GraphArchiveReader, GraphArchiveWriter, main, _decode_varints, _encode_varints
+from util.src.graph_generator import GraphGenerator
+
+
+class TestGraphArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graphs.sga')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_same_edges(self, expected: Graph, actual: Graph):
+        self.assertEqual(expected.get_vertices(), actual.get_vertices())
+        self.assertEqual(sorted((min(u, v), max(u, v), w) for u, v, w in expected.get_edges()),
+                         sorted((min(u, v), max(u, v), w) for u, v, w in actual.get_edges()))
+
+    def test_varints(self):
+        values = np.array([0, 1, 127, 128, 300, 16383, 16384, 2 ** 40, 2 ** 62], dtype=np.int64)
+        encoded = _encode_varints(values)
+        self.assertEqual(encoded[:5], bytes([0, 1, 127, 0x80, 1]))
+        np.testing.assert_array_equal(_decode_varints(encoded), values)
+        self.assertEqual(len(_decode_varints(_encode_varints(np.zeros(0, dtype=np.int64)))), 0)
+
+    def test_round_trip(self):
+        generator = GraphGenerator(seed=3)
+        complete = generator.complete(30, 40)
+        sparse = generator.random(200, 5, 70)
+        other = Graph('other', list(range(1, 8)))
+        # isolated vertices, edges in both orientations and far apart neighbors
+        other.add_edge(5, 1, -1)
+        other.add_edge(1, 7, 1)
+        other.add_edge(3, 2, 1)
+        with GraphArchiveWriter(self.path) as archive:
+            archive.add(complete)
+            archive.add(sparse, 'sparse')
+            archive.add(other)
+            with self.assertRaises(ValueError):
+                archive.add(other)
+
+        with GraphArchiveReader(self.path) as archive:
+            self.assertEqual(archive.get_names(), [complete.get_name(), 'sparse', 'other'])
+            self.assertIn('sparse', archive)
+            self.assertEqual(archive.get_info(complete.get_name())['kind'], 'complete')
+            self.assertEqual(archive.get_info('sparse')['kind'], 'sparse')
+            # random access, in any order
+            self.assert_same_edges(other, archive.read('other'))
+            self.assert_same_edges(complete, archive.read(complete.get_name()))
+            self.assert_same_edges(sparse, archive.read('sparse'))
+            self.assertEqual(archive.read('sparse').get_name(), 'sparse')
+
+    def test_rejects_other_weights(self):
+        graph = Graph('weighted', [1, 2])
+        graph.add_edge(1, 2, 3)
+        with GraphArchiveWriter(self.path) as archive:
+            with self.assertRaises(ValueError):
+                archive.add(graph)
+        with open(self.path, 'wb') as file:
+            file.write(b'not an archive')
+        with self.assertRaises(ValueError):
+            GraphArchiveReader(self.path)
+
+    def test_command_line(self):
+        source = os.path.join(self.directory.name, 'source')
+        graph = GraphGenerator(seed=1).random(20, 30, 50, name='random_graph')
+        graph.save_graph_to_file(os.path.join(source, 'family') + os.sep)
+        self.assertEqual(main(['pack', self.path, source]), 0)
+        destination = os.path.join(self.directory.name, 'destination')
+        self.assertEqual(main(['extract', self.path, destination]), 0)
+        extracted = Graph()
+        extracted.read_graph_from_file(os.path.join(destination, 'source', 'family', 'random_graph.txt'))
+        self.assert_same_edges(graph, extracted)
+
+
+if __name__ == '__main__':
+    unittest.main()
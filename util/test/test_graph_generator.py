@@ -0,0 +1,51 @@
+import unittest
+
+from util.src.graph_generator import GraphGenerator
+
+
+class TestGraphGenerator(unittest.TestCase):
+    def assert_simple(self, graph, num_vertices):
+        self.assertEqual(list(range(1, num_vertices + 1)), graph.get_vertices())
+        pairs = [(u, v) for u, v, _ in graph.get_edges()]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        for u, v, w in graph.get_edges():
+            self.assertTrue(1 <= u < v <= num_vertices)
+            self.assertIn(w, (-1, 1))
+
+    def test_complete(self):
+        graph = GraphGenerator(seed=1).complete(30, 80)
+        self.assert_simple(graph, 30)
+        self.assertEqual(435, len(graph.get_edges()))
+        self.assertTrue(graph.is_complete())
+        self.assertEqual("complete_30x435_100_20", graph.get_name())
+        self.assertAlmostEqual(0.8, graph.get_number_of_positives_edges() / 435, delta=0.1)
+
+    def test_random(self):
+        graph = GraphGenerator(seed=1).random(250, 80, 20)
+        self.assert_simple(graph, 250)
+        self.assertEqual(24900, len(graph.get_edges()))
+        self.assertEqual("random_250x24900_80_80", graph.get_name())
+        self.assertEqual(sorted(graph.get_edges()), graph.get_edges())
+
+        # every pair can be drawn
+        graph = GraphGenerator(seed=2).random(40, 100, 50)
+        self.assertTrue(graph.is_complete())
+
+        graph = GraphGenerator(seed=3).random(1000, 1, 50, exact_edge_count=False)
+        self.assert_simple(graph, 1000)
+        self.assertAlmostEqual(4995, len(graph.get_edges()), delta=400)
+
+    def test_interval(self):
+        graph = GraphGenerator(seed=1).interval(300, 50, 50)
+        self.assert_simple(graph, 300)
+        self.assertAlmostEqual(0.5, graph.get_density(), delta=0.1)
+        self.assertTrue(GraphGenerator(seed=1).interval(20, 100, 50).is_complete())
+
+    def test_seed(self):
+        first = GraphGenerator(seed=5).random(100, 20, 50)
+        second = GraphGenerator(seed=5).random(100, 20, 50)
+        self.assertEqual(first.get_edges(), second.get_edges())
+
+
+if __name__ == '__main__':
+    unittest.main()
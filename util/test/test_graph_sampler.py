@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from util.src.graph import Graph
+from util.src.graph_sampler import GraphSampler
+
+
+class TestGraphSampler(unittest.TestCase):
+    def setUp(self):
+        # A path 1-2-...-10 with alternating signs plus a disconnected edge 11-12
+        self.vertices = list(range(1, 13))
+        self.edges = [(i, i + 1, 1 if i % 2 else -1) for i in range(1, 10)] + [(11, 12, -1)]
+        self.graph = Graph(name="path", vertices=self.vertices, edges=self.edges)
+
+    def assert_induced(self, subgraph, num_vertices):
+        vertices = set(subgraph.get_vertices())
+        self.assertEqual(num_vertices, len(vertices))
+        self.assertEqual(len(vertices), len(subgraph.get_vertices()))
+        expected_edges = {(u, v, w) for u, v, w in self.edges if u in vertices and v in vertices}
+        self.assertEqual(expected_edges, {(min(u, v), max(u, v), w) for u, v, w in subgraph.get_edges()})
+
+    def test_snowball(self):
+        subgraph = GraphSampler(self.graph, rng=random.Random(1)).snowball(5)
+        self.assert_induced(subgraph, 5)
+        self.assertEqual("5path", subgraph.get_name())
+        # a breadth first search on a path samples a connected piece of it
+        self.assertEqual(4, len(subgraph.get_edges()))
+
+    def test_random_walk(self):
+        subgraph = GraphSampler(self.graph, rng=random.Random(1)).random_walk(6, restart_probability=0.2)
+        self.assert_induced(subgraph, 6)
+
+    def test_forest_fire(self):
+        subgraph = GraphSampler(self.graph, rng=random.Random(1)).forest_fire(6)
+        self.assert_induced(subgraph, 6)
+        with self.assertRaises(ValueError):
+            GraphSampler(self.graph).forest_fire(6, burning_probability=1)
+
+    def test_sample_whole_graph(self):
+        # components are exhausted, so the samplers need several seed vertices
+        sampler = GraphSampler(self.graph, rng=random.Random(3))
+        for subgraph in [sampler.snowball(20), sampler.random_walk(12), sampler.forest_fire(12)]:
+            self.assert_induced(subgraph, 12)
+
+    def test_reproducible(self):
+        first = GraphSampler(self.graph, rng=random.Random(5)).forest_fire(7)
+        second = GraphSampler(self.graph, rng=random.Random(5)).forest_fire(7)
+        self.assertEqual(first.get_vertices(), second.get_vertices())
+        self.assertEqual(first.get_edges(), second.get_edges())
+
+    def test_random_walk_small_components(self):
+        # a long path and many components of two vertices, which are exhausted right after their seed is drawn
+        edges = [(i, i + 1, 1) for i in range(1, 1000)] + [(i, i + 1, -1) for i in range(1001, 1100, 2)]
+        graph = Graph(vertices=list(range(1, 1101)), edges=edges)
+        rng = random.Random(2)
+        draws = []
+        random_draw = rng.random
+        rng.random = lambda: draws.append(None) or random_draw()
+        subgraph = GraphSampler(graph, rng=rng).random_walk(1000)
+        self.assertEqual(1000, len(subgraph.get_vertices()))
+        # the steps of a walk stuck in an exhausted component do not grow with the sample size
+        self.assertLess(len(draws), 200000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from util.src.graph import Graph
+from util.src.graph_archive import GraphArchiveWriter
+from util.src.graph_generator import GraphGenerator
+from util.src.graph_server import CompactGraph, GraphClient, GraphServer
+
+
+class TestCompactGraph(unittest.TestCase):
+    def test_queries(self):
+        graph = GraphGenerator(seed=8).random(80, 10, 60)
+        compact = CompactGraph.from_graph(graph)
+        vertices = [5, 1, 80, 5]
+        degrees, positive, negative = compact.degrees(vertices)
+        self.assertEqual([graph.get_degree(vertex) for vertex in vertices], degrees)
+        self.assertEqual([graph.get_positive_degree(vertex) for vertex in vertices], positive)
+        self.assertEqual([graph.get_negative_degree(vertex) for vertex in vertices], negative)
+        self.assertEqual([sorted(graph.get_adjacent_vertices(vertex)) for vertex in vertices],
+                         compact.neighbors(vertices))
+        subgraph = graph.induced_subgraph(list(range(1, 31)))
+        self.assertCountEqual([(min(u, v), max(u, v), w) for u, v, w in subgraph.get_edges()],
+                              compact.subgraph(list(range(30, 0, -1))))
+        self.assertEqual(graph.fingerprint(), compact.stats()['fingerprint'])
+        with self.assertRaises(ValueError):
+            compact.degrees([81])
+
+    def test_self_loops(self):
+        compact = CompactGraph.from_graph(Graph(vertices=[1, 2, 3], edges=[(2, 2, -1), (1, 2, 1), (2, 2, 1)]))
+        # a self-loop counts once, as in Graph.get_degree
+        self.assertEqual(([1, 3, 0], [1, 2, 0], [0, 1, 0]), compact.degrees([1, 2, 3]))
+        self.assertEqual(3, compact.stats()['max_degree'])
+        self.assertEqual([(1, 2, 1), (2, 2, -1), (2, 2, 1)], compact.subgraph([1, 2]))
+        self.assertEqual([(2, 2, -1), (2, 2, 1)], compact.subgraph([2]))
+
+
+class TestGraphServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, 'graphs.sock')
+        self.graph = GraphGenerator(seed=1).random(50, 20, 50, name='first')
+        self.graph.save_graph_to_file(self.directory.name + os.sep)
+        self.path = os.path.join(self.directory.name, 'first.txt')
+        GraphGenerator(seed=2).random(30, 20, 50, name='second').save_graph_to_file(self.directory.name + os.sep)
+        self.other_path = os.path.join(self.directory.name, 'second.txt')
+        self.server = GraphServer(max_graphs=1)
+        self.start_server(socket_path=self.socket_path)
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.directory.cleanup()
+
+    def start_server(self, **address):
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.asyncio_server = self.loop.run_until_complete(self.server.start(**address))
+            started.set()
+            self.loop.run_forever()
+            self.asyncio_server.close()
+            self.loop.run_until_complete(self.asyncio_server.wait_closed())
+            self.loop.close()
+
+        self.thread = threading.Thread(target=serve)
+        self.thread.start()
+        started.wait()
+
+    def test_queries(self):
+        with GraphClient(socket_path=self.socket_path, timeout=10) as client:
+            self.assertEqual('pong', client.ping())
+            stats = client.stats(self.path)
+            self.assertEqual(('first', 50, len(self.graph.get_edges())), (stats['name'], stats['vertices'],
+                                                                            stats['edges']))
+            self.assertEqual(self.graph.get_number_of_positives_edges(), stats['positive_edges'])
+            self.assertEqual([self.graph.get_degree(vertex) for vertex in (1, 2, 3)],
+                             client.degrees(self.path, [1, 2, 3])['degree'])
+            self.assertEqual([sorted(self.graph.get_adjacent_vertices(7))], client.neighbors(self.path, [7]))
+            subgraph = client.subgraph(self.path, [1, 2, 3, 4, 5, 6])
+            self.assertEqual([1, 2, 3, 4, 5, 6], subgraph.get_vertices())
+            self.assertEqual(self.graph.induced_subgraph([1, 2, 3, 4, 5, 6]).fingerprint(), subgraph.fingerprint())
+
+            with self.assertRaises(ValueError):
+                client.degrees(self.path, [0])
+            with self.assertRaises(ValueError):
+                client.request('unknown')
+            with self.assertRaises(ValueError):
+                client.stats(os.path.join(self.directory.name, 'missing.txt'))
+            # the connection is still usable after the errors
+            self.assertEqual('pong', client.ping())
+
+    def test_cache(self):
+        with GraphClient(socket_path=self.socket_path, timeout=10) as client:
+            client.stats(self.path)
+            self.assertEqual([os.path.realpath(self.path)], [entry['path'] for entry in client.request('cache')])
+            # the cache only keeps one graph
+            client.stats(self.other_path)
+            self.assertEqual([os.path.realpath(self.other_path)], [entry['path'] for entry in client.request('cache')])
+            self.assertTrue(client.request('evict', path=self.other_path))
+            self.assertEqual([], client.request('cache'))
+
+            # a graph is loaded again when its file changes
+            self.assertEqual(50, client.stats(self.path)['vertices'])
+            modified = os.path.getmtime(self.path)
+            Graph('first', [1, 2, 3], [(1, 2, 1)]).save_graph_to_file(self.directory.name + os.sep)
+            os.utime(self.path, (modified + 10, modified + 10))
+            self.assertEqual(3, client.stats(self.path)['vertices'])
+
+    def test_archive_and_clients(self):
+        archive_path = os.path.join(self.directory.name, 'graphs.sga')
+        with GraphArchiveWriter(archive_path) as archive:
+            archive.add(self.graph)
+        results = []
+
+        def query():
+            with GraphClient(socket_path=self.socket_path, timeout=10) as client:
+                results.append(client.stats(archive_path, 'first')['fingerprint'])
+
+        clients = [threading.Thread(target=query) for _ in range(4)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        self.assertEqual([self.graph.fingerprint()] * 4, results)
+
+    def test_corrupt_archive(self):
+        archive_path = os.path.join(self.directory.name, 'graphs.sga')
+        with GraphArchiveWriter(archive_path) as archive:
+            archive.add(self.graph)
+        with open(archive_path, 'r+b') as file:
+            # the block of the graph starts after the 8 bytes of the magic number
+            file.seek(13)
+            file.write(bytes(20))
+        with GraphClient(socket_path=self.socket_path, timeout=10) as client:
+            with self.assertRaisesRegex(ValueError, 'zlib.error'):
+                client.stats(archive_path, 'first')
+            self.assertEqual('pong', client.ping())
+
+    def test_tcp(self):
+        self.tearDown()
+        self.directory = tempfile.TemporaryDirectory()
+        self.start_server(host='127.0.0.1', port=0)
+        port = self.asyncio_server.sockets[0].getsockname()[1]
+        with GraphClient(host='127.0.0.1', port=port, timeout=10) as client:
+            self.assertEqual('pong', client.ping())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+
+from util.src.graph import Graph
+from util.src.instance_parser_interface import InstanceParserInterface
+from util.src.instrumentation import Instrumentation, instrumentation
+
+
+class DummyInstanceParser(InstanceParserInterface):
+    def parse(self, content: str):
+        return [Graph(name="dummy", vertices=[1, 2, 3], edges=[(1, 2, 1), (2, 3, -1)])]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph(vertices=[1, 2, 3, 4, 5], edges=[(1, 2, 1), (1, 3, 1), (2, 3, -1), (4, 5, -1)])
+        self.directory = tempfile.TemporaryDirectory()
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+        self.directory.cleanup()
+
+    def test_disabled(self):
+        instrumentation.disable()
+        self.graph.generate_numeric_graph()
+        self.assertEqual({}, instrumentation.report()["stages"])
+
+    def test_stages(self):
+        instrumentation.enable(trace_memory=True)
+        self.graph.generate_numeric_graph()
+        self.graph.generate_numeric_graph()
+        self.graph.generate_subgraph(3)
+        graphs = DummyInstanceParser().parse("")
+        with instrumentation.stage("custom", edges=10):
+            instrumentation.count("graphs", 2)
+
+        stages = instrumentation.report()["stages"]
+        self.assertEqual(2, stages["anonymize"]["calls"])
+        self.assertEqual(8, stages["anonymize"]["edges"])
+        self.assertEqual(3, stages["sample"]["edges"])
+        self.assertEqual(2, stages["parse"]["edges"])
+        self.assertEqual(10, stages["custom"]["edges"])
+        self.assertIn("peak_traced_bytes", stages["anonymize"])
+        if "peak_rss_kb" in stages["anonymize"]:
+            # a temporary allocation counts in the peak of its stage and of the enclosing stages
+            with instrumentation.stage("outer"):
+                with instrumentation.stage("allocate"):
+                    data = bytes(range(256)) * (512 * 1024)
+                    del data
+                with instrumentation.stage("after"):
+                    pass
+            report = instrumentation.report()
+            stages = report["stages"]
+            self.assertGreater(stages["allocate"]["peak_rss_kb"] - stages["after"]["peak_rss_kb"], 96 * 1024)
+            self.assertGreaterEqual(stages["outer"]["peak_rss_kb"], stages["allocate"]["peak_rss_kb"])
+            self.assertGreaterEqual(report["peak_rss_kb"], stages["allocate"]["peak_rss_kb"])
+        elif os.path.exists("/proc/self/statm"):
+            self.assertGreater(stages["anonymize"]["rss_kb"], 0)
+        self.assertEqual({"graphs": 2}, instrumentation.report()["counters"])
+        self.assertEqual("dummy", graphs[0].get_name())
+
+    def test_write_report(self):
+        instrumentation.enable(profile=True)
+        self.graph.save_graph_to_file(self.directory.name + "/", "graph.txt")
+        path = os.path.join(self.directory.name, "report", "instrumentation.json")
+        instrumentation.write_report(path)
+        with open(path) as file:
+            report = json.load(file)
+        self.assertEqual(1, report["stages"]["save"]["calls"])
+        self.assertEqual(4, report["stages"]["save"]["edges"])
+        self.assertTrue(os.path.exists(report["profile"]))
+
+    def test_profile_after_disable(self):
+        instrumentation.enable(profile=True)
+        instrumentation.disable()
+        instrumentation.enable(profile=True)
+        self.graph.generate_numeric_graph()
+        path = os.path.join(self.directory.name, "instrumentation.json")
+        instrumentation.write_report(path)
+        stats = pstats.Stats(os.path.splitext(path)[0] + ".prof")
+        self.assertIn("generate_numeric_graph", [function for _, _, function in stats.stats])
+
+    def test_environment(self):
+        for value, expected in [("", (False, False, False)), ("1", (True, False, False)),
+                                ("memory", (True, False, True)), ("profile, memory", (True, True, True))]:
+            with mock.patch.dict(os.environ, {"SIGNED_GRAPHS_INSTRUMENTATION": value}):
+                environment_instrumentation = Instrumentation()
+            try:
+                self.assertEqual(expected, (environment_instrumentation.enabled,
+                                            environment_instrumentation._profiler is not None,
+                                            environment_instrumentation._trace_memory))
+            finally:
+                environment_instrumentation.disable()
+        with mock.patch.dict(os.environ, {"SIGNED_GRAPHS_INSTRUMENTATION": "yes"}):
+            with self.assertRaises(ValueError):
+                Instrumentation()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from util.src.graph import Graph
+from util.src.instance_parser_interface import InstanceParserInterface
+from util.src.properties_store import PropertiesStore
+
+
+class DummyInstanceParser(InstanceParserInterface):
+    def parse(self, content: str):
+        pass
+
+
+def add_rows(path, worker):
+    store = PropertiesStore(path)
+    for i in range(20):
+        store.add([{'Graph name': f'graph{worker}-{i}', 'vertices': i}])
+
+
+def upsert_rows(path, worker):
+    store = PropertiesStore(path)
+    for i in range(20):
+        store.upsert([{'Graph name': f'graph{worker}-{i}', 'vertices': i}])
+
+
+class TestPropertiesStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'properties.txt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_upsert(self):
+        store = PropertiesStore(self.path)
+        store.upsert([{'Graph name': 'a', 'vertices': 3}, {'Graph name': 'b', 'vertices': 4}])
+        store.upsert([{'Graph name': 'a', 'vertices': 5, 'complete': True}])
+        self.assertEqual([{'Graph name': 'a', 'vertices': '5', 'complete': 'True'},
+                          {'Graph name': 'b', 'vertices': '4', 'complete': ''}], store.read())
+        with open(self.path) as file:
+            self.assertEqual('Graph name\tvertices\tcomplete\na\t5\tTrue\nb\t4\t\n', file.read())
+
+        columns = store.load_columns()
+        self.assertEqual(['a', 'b'], columns['Graph name'].tolist())
+        self.assertEqual([5.0, 4.0], columns['vertices'].tolist())
+        with self.assertRaises(ValueError):
+            store.add([{'vertices': 1}])
+
+    def test_key_columns(self):
+        store = PropertiesStore(os.path.join(self.directory.name, 'properties.csv'), key_columns=('Graph name', 'seed'))
+        store.upsert([{'Graph name': 'a', 'seed': 1, 'edges': 3}, {'Graph name': 'a', 'seed': 2, 'edges': 4}])
+        store.upsert([{'Graph name': 'a', 'seed': 2, 'edges': 6}])
+        self.assertEqual([['a', '1', '3'], ['a', '2', '6']], [list(row.values()) for row in store.read()])
+        with open(os.path.join(self.directory.name, 'properties.csv')) as file:
+            self.assertEqual('Graph name,seed,edges\n', file.readline())
+
+    def test_parallel_workers(self):
+        workers = [multiprocessing.Process(target=add_rows, args=(self.path, worker)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        rows = PropertiesStore(self.path).merge()
+        self.assertEqual(80, len(rows))
+        self.assertEqual([], os.listdir(self.path + '.shards'))
+
+    def test_parallel_upserts(self):
+        # every worker merges after each row, as export_properties does
+        workers = [multiprocessing.Process(target=upsert_rows, args=(self.path, worker)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(80, len(PropertiesStore(self.path).read()))
+
+    def test_merge_between_open_and_lock(self):
+        from unittest import mock
+        from util.src import properties_store
+
+        store = PropertiesStore(self.path)
+        store.add([{'Graph name': 'a'}])
+        locked = properties_store._locked
+        merged = []
+
+        def merge_then_lock(file):
+            # a merge of another process runs after the shard is opened and before it is locked
+            if not merged and file.name.endswith('.jsonl'):
+                merged.append(True)
+                PropertiesStore(self.path).merge()
+            return locked(file)
+
+        with mock.patch.object(properties_store, '_locked', merge_then_lock):
+            store.add([{'Graph name': 'b'}])
+        self.assertEqual(['a', 'b'], [row['Graph name'] for row in store.merge()])
+
+    def test_export_properties(self):
+        parser = DummyInstanceParser()
+        graph = Graph(name='graph', vertices=[1, 2, 3], edges=[(1, 2, 1), (2, 3, -1)])
+        parser.export_properties(self.directory.name, 'properties.txt', [graph])
+        parser.export_graph_properties(self.directory.name, 'properties.txt', graph)
+        with open(self.path) as file:
+            lines = file.read().splitlines()
+        self.assertEqual('Graph name\tvertices\tedges\tdensity\tdegree\taverage_degree\taverage_pos_degree\t'
+                         'average_neg_degree\taverage_weight\tcomplete\tmax_core', lines[0])
+        self.assertEqual(['graph\t3\t2\t0.6666666666666666\t2\t1.3333333333333333\t0.6666666666666666\t'
+                          '0.6666666666666666\t0.0\tFalse\t1'], lines[1:])
+
+    def test_export_properties_parameters(self):
+        parser = DummyInstanceParser()
+        first = Graph(name='3graph', vertices=[1, 2, 3], edges=[(1, 2, 1)])
+        second = Graph(name='3graph', vertices=[1, 2, 3], edges=[(1, 2, 1), (2, 3, -1)])
+        for graph, parameters in [(first, {'sampler': 'snowball', 'seed': 1}),
+                                  (second, {'sampler': 'forest_fire', 'seed': 1}),
+                                  (second, {'sampler': 'snowball', 'seed': 2}),
+                                  # a rerun replaces the row with the same name and parameters
+                                  (second, {'sampler': 'snowball', 'seed': 1})]:
+            parser.export_graph_properties(self.directory.name, 'properties.txt', graph, parameters)
+        rows = PropertiesStore(self.path).read()
+        self.assertEqual(['Graph name', 'sampler', 'seed', 'vertices'], list(rows[0])[:4])
+        self.assertEqual([('snowball', '1', '2'), ('forest_fire', '1', '2'), ('snowball', '2', '2')],
+                         [(row['sampler'], row['seed'], row['edges']) for row in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from util.src.temporal_snapshots import temporal_snapshots
+
+
+class TestTemporalSnapshots(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        # few vertices and repeated timestamps, so pairs are rated many times, in both directions
+        self.ratings = [(rng.randrange(200), rng.randrange(1, 13), rng.randrange(1, 13), rng.choice([1, -1]))
+                        for _ in range(400)]
+
+    def brute_force(self, cut_point, window):
+        # sign of the most recent rating of each pair in the snapshot, built from scratch
+        edges = {}
+        for timestamp, u, v, sign in sorted(self.ratings):
+            if u != v and timestamp <= cut_point and (window is None or timestamp > cut_point - window):
+                edges[(min(u, v), max(u, v))] = sign
+        return edges
+
+    def assert_snapshots(self, cut_points, window):
+        snapshots = 0
+        for cut_point, graph in temporal_snapshots('ratings', self.ratings, cut_points, window):
+            edges = {(min(u, v), max(u, v)): w for u, v, w in graph.get_edges()}
+            self.assertEqual(len(edges), len(graph.get_edges()))
+            self.assertEqual(self.brute_force(cut_point, window), edges)
+            self.assertEqual(sorted((v if u == 5 else u, w) for (u, v), w in edges.items() if 5 in (u, v)),
+                             sorted(graph.get_adjacent_vertices(5)))
+            snapshots += 1
+        return snapshots
+
+    def test_cumulative(self):
+        self.assertEqual(10, self.assert_snapshots(10, None))
+        self.assertEqual(4, self.assert_snapshots([-1, 0, 57, 300], None))
+
+    def test_window(self):
+        for window in (1, 15, 80):
+            self.assertEqual(25, self.assert_snapshots(25, window))
+
+    def test_vertices(self):
+        _, graph = next(temporal_snapshots('ratings', [(3, 2, 7, 1), (5, 9, 9, -1)], 1))
+        self.assertEqual(list(range(1, 8)), graph.get_vertices())
+        self.assertEqual([(2, 7, 1)], graph.get_edges())
+
+    def test_no_ratings(self):
+        with self.assertRaises(ValueError):
+            list(temporal_snapshots('ratings', [], 3))
+        with self.assertRaises(ValueError):
+            list(temporal_snapshots('ratings', [(1, 4, 4, 1)], 3))
+
+
+if __name__ == '__main__':
+    unittest.main()